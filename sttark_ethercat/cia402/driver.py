@@ -1,15 +1,36 @@
 import logging
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Union
 
-from ..commands import CommandType
-from ..constants import MODE_PP, MODE_PV, MODE_PT, MODE_CSP
-from ..utils.checks import nonblocking_check
+from ..commands import COMMAND_CODES, CommandType
+from ..constants import (
+    MODE_PP, MODE_PV, MODE_PT, MODE_CSP, MODE_FROM_NAME, PROBE_ARM_LUT,
+    SW_MASK_FAULT, SW_MASK_WARNING, SW_MASK_TARGET_REACHED, SW_MASK_SETPOINT_ACK,
+)
+from ..utils.checks import MAX_PENDING_CHECKS, nonblocking_check
 
 
 logger = logging.getLogger(__name__)
 
 
+_CODE_SET_POSITION_CSP = COMMAND_CODES[CommandType.SET_POSITION_CSP]
+
+
+def _unit_params(unit: str) -> Optional[Dict]:
+    # 'native' is the process-side default, so it needs no params dict at all.
+    return None if unit == 'native' else {'unit': unit}
+
+
+# Placeholders until attach_drive_handle() injects the real process handlers.
+def _unattached_enqueue(pos: int, cmd_type: CommandType, value, params: Optional[Dict]) -> None:
+    raise RuntimeError("Command queue handler not attached")
+
+
+def _unattached_read(pos: int, key: str):
+    return None
+
+
 @dataclass
 class PdoMap:
     # Offsets will be assigned by the process during registration
@@ -25,8 +46,13 @@ class CiA402Drive:
     def __init__(self, slave_position: int, pdo_map: Optional[PdoMap] = None):
         self.slave_position = slave_position
         self._pdo_map = pdo_map
-        self._pending_checks = []
-        self._last_intent: Optional[Dict] = None
+        # Preallocated and bounded, so mode switches never pay for list growth.
+        self._pending_checks = deque(maxlen=MAX_PENDING_CHECKS)
+        self._last_intent_code: int = 0  # COMMAND_CODES of the last queued intent; 0 = none
+        self._enqueue_command = _unattached_enqueue
+        self._read_status = _unattached_read
+        # Direct CSP set-point writer (native units), injected by attach_drive_handle when available.
+        self._fast_set_csp: Optional[Callable[[float], bool]] = None
 
         # Feature flags - to be populated from XML decoder and runtime checks
         self.supports: Dict[str, bool] = {
@@ -56,13 +82,23 @@ class CiA402Drive:
         self._queue(CommandType.SET_CSP_MODE)
         return True
 
+    def set_mode(self, mode: Union[int, str], safe_switch: bool = False) -> bool:
+        """Switch modes by MODE_* value or by name ('pp', 'pv', 'pt', 'csp')."""
+        if isinstance(mode, str):
+            mode = MODE_FROM_NAME.get(mode.lower(), -1)
+        setter = _MODE_SETTERS.get(mode)
+        if setter is None:
+            logger.error("Slave %d: unsupported mode %r", self.slave_position, mode)
+            return False
+        return setter(self, safe_switch)
+
     # Motion
     def set_velocity(self, velocity: float, unit: str = 'native') -> bool:
-        self._queue(CommandType.SET_VELOCITY, value=velocity, params={'unit': unit})
+        self._queue(CommandType.SET_VELOCITY, value=velocity, params=_unit_params(unit))
         return True
 
     def set_torque(self, torque: float, unit: str = 'native') -> bool:
-        self._queue(CommandType.SET_TORQUE, value=torque, params={'unit': unit})
+        self._queue(CommandType.SET_TORQUE, value=torque, params=_unit_params(unit))
         return True
 
     def set_max_torque(self, max_torque: int) -> bool:
@@ -75,11 +111,16 @@ class CiA402Drive:
         return True
 
     def set_position_absolute(self, position: float, unit: str = 'native') -> bool:
-        self._queue(CommandType.SET_POSITION, value=position, params={'unit': unit})
+        self._queue(CommandType.SET_POSITION, value=position, params=_unit_params(unit))
         return True
 
     def set_position_csp(self, position: float, unit: str = 'native') -> bool:
-        self._queue(CommandType.SET_POSITION_CSP, value=position, params={'unit': unit})
+        if unit == 'native' and self._fast_set_csp is not None:
+            ok = self._fast_set_csp(position)
+            if ok:
+                self._last_intent_code = _CODE_SET_POSITION_CSP
+            return ok
+        self._queue(CommandType.SET_POSITION_CSP, value=position, params=_unit_params(unit))
         return True
 
     # Ruckig motion (CSP streaming inside process)
@@ -156,15 +197,11 @@ class CiA402Drive:
     # Probe
     def arm_probe(self, edge: str = 'positive', continuous: bool = False) -> bool:
         if not self.supports.get('touch_probe', False):
-            logger.warning(f"Slave {self.slave_position}: touch probe not supported")
+            logger.warning("Slave %d: touch probe not supported", self.slave_position)
             return False
-        probe_function = None
-        if edge == 'positive':
-            probe_function = 0x0005
-        elif edge == 'negative':
-            probe_function = 0x0009
-        else:
-            logger.error(f"Invalid probe edge: {edge}")
+        probe_function = PROBE_ARM_LUT.get(edge)
+        if probe_function is None:
+            logger.error("Invalid probe edge: %s", edge)
             return False
         self._queue(CommandType.ARM_PROBE, params={'probe_function': probe_function, 'continuous': continuous})
         return True
@@ -182,34 +219,18 @@ class CiA402Drive:
     def get_status_word(self) -> Optional[int]:
         return self._read_status_field('statusword')
 
+    # Status flags: prefer the derived field if published; otherwise test the raw statusword bit.
     def is_target_reached(self) -> bool:
-        # Prefer derived field if published; otherwise fall back to raw statusword bit 10.
-        tr = self._read_status_field('target_reached')
-        if tr is not None:
-            return bool(tr)
-        sw = self.get_status_word() or 0
-        return bool(sw & 0x0400)
+        return self._status_bit('target_reached', SW_MASK_TARGET_REACHED)
 
     def is_in_fault(self) -> bool:
-        fault = self._read_status_field('fault')
-        if fault is not None:
-            return bool(fault)
-        sw = self.get_status_word() or 0
-        return bool(sw & 0x0008)
+        return self._status_bit('fault', SW_MASK_FAULT)
 
     def has_warning(self) -> bool:
-        warning = self._read_status_field('warning')
-        if warning is not None:
-            return bool(warning)
-        sw = self.get_status_word() or 0
-        return bool(sw & 0x0080)
+        return self._status_bit('warning', SW_MASK_WARNING)
 
     def is_setpoint_acknowledged(self) -> bool:
-        ack = self._read_status_field('setpoint_ack')
-        if ack is not None:
-            return bool(ack)
-        sw = self.get_status_word() or 0
-        return bool(sw & 0x1000)
+        return self._status_bit('setpoint_ack', SW_MASK_SETPOINT_ACK)
 
     def get_position(self, unit: str = 'native') -> Optional[float]:
         return self._read_status_field('position_actual')
@@ -225,48 +246,48 @@ class CiA402Drive:
 
     # Internal helpers delegated to the process runtime via injection
     def _queue(self, cmd_type: CommandType, value: Optional[float] = None, params: Optional[Dict] = None) -> None:
-        if not hasattr(self, '_enqueue_command'):
-            raise RuntimeError("Command queue handler not attached")
-        self._last_intent = {'type': cmd_type, 'value': value, 'params': params or {}}
-        self._enqueue_command(self.slave_position, cmd_type, value, params or {})
+        self._enqueue_command(self.slave_position, cmd_type, value, params)
+        self._last_intent_code = COMMAND_CODES[cmd_type]
 
     def _read_status_field(self, key: str):
-        if not hasattr(self, '_read_status'):
-            return None
         return self._read_status(self.slave_position, key)
 
+    def _status_bit(self, key: str, sw_mask: int) -> bool:
+        read = self._read_status
+        value = read(self.slave_position, key)
+        if value is not None:
+            return bool(value)
+        return bool((read(self.slave_position, 'statusword') or 0) & sw_mask)
+
     # Verification hook used by @nonblocking_check
     def _verify_last_action(self) -> bool:
-        if not self._last_intent:
-            return True
-        intent = self._last_intent
-        if intent['type'] == CommandType.SET_POSITION_MODE:
-            mode = self._read_status_field('mode_display')
-            # If mode display is not mapped into PDO, do NOT try to "fake" it.
-            # Treat verification as unknown/acceptable; the end application may SDO-read if it cares.
-            if mode is None:
-                return True
-            return mode == MODE_PP
-        if intent['type'] == CommandType.SET_VELOCITY_MODE:
-            mode = self._read_status_field('mode_display')
-            if mode is None:
-                return True
-            return mode == MODE_PV
-        if intent['type'] == CommandType.SET_TORQUE_MODE:
-            mode = self._read_status_field('mode_display')
-            if mode is None:
-                return True
-            return mode == MODE_PT
-        if intent['type'] == CommandType.SET_CSP_MODE:
-            mode = self._read_status_field('mode_display')
-            if mode is None:
-                return True
-            return mode == MODE_CSP
-        if intent['type'] in (CommandType.SET_POSITION, CommandType.SET_POSITION_CSP):
-            # Non-strict: position should move toward target; exact verification is domain-specific
-            return True
-        if intent['type'] == CommandType.SET_VELOCITY:
-            return True
-        return True
-
-
+        verify = _VERIFIERS.get(self._last_intent_code)
+        return True if verify is None else verify(self)
+
+
+def _mode_verifier(expected_mode: int) -> Callable[[CiA402Drive], bool]:
+    def verify(drive: CiA402Drive) -> bool:
+        mode = drive._read_status_field('mode_display')
+        # If mode display is not mapped into PDO, do NOT try to "fake" it.
+        # Treat verification as unknown/acceptable; the end application may SDO-read if it cares.
+        return mode is None or mode == expected_mode
+    return verify
+
+
+# Intent code -> verifier. Intents without an entry (no intent yet, set-points whose
+# exact verification is domain-specific) are accepted as-is.
+_VERIFIERS: Dict[int, Callable[[CiA402Drive], bool]] = {
+    COMMAND_CODES[CommandType.SET_POSITION_MODE]: _mode_verifier(MODE_PP),
+    COMMAND_CODES[CommandType.SET_VELOCITY_MODE]: _mode_verifier(MODE_PV),
+    COMMAND_CODES[CommandType.SET_TORQUE_MODE]: _mode_verifier(MODE_PT),
+    COMMAND_CODES[CommandType.SET_CSP_MODE]: _mode_verifier(MODE_CSP),
+}
+
+
+# Mode value -> mode-switch method, for set_mode().
+_MODE_SETTERS: Dict[int, Callable[[CiA402Drive, bool], bool]] = {
+    MODE_PP: CiA402Drive.set_position_mode,
+    MODE_PV: CiA402Drive.set_velocity_mode,
+    MODE_PT: CiA402Drive.set_torque_mode,
+    MODE_CSP: CiA402Drive.set_csp_mode,
+}
@@ -1,44 +1,62 @@
 import logging
-import time
 from typing import Callable, Dict, Optional
 
 from .cia402.driver import CiA402Drive
+from .command_ring import RING_COMMAND_TYPES
 from .commands import Command, CommandType
 from .config_schema import EthercatNetworkConfig
 from .process_manager import EtherCATProcessManager
 from .status_model import NetworkStatus
+from . import shm_layout as SHM
+
+
+# Fields the cyclic process publishes in the shared actuals block; these are read
+# in place instead of through a rebuilt NetworkStatus.
+_SHM_FIELDS = frozenset(SHM.DRIVE_FIELD_SLOTS) | frozenset(SHM.DRIVE_STATUSWORD_FLAGS)
 
 
 class StatusProxy:
     def __init__(self, manager: EtherCATProcessManager):
         self._manager = manager
         self._last: Optional[NetworkStatus] = None
-        self._last_at: float = 0.0
+        self._last_seq: int = 0
 
     def _refresh(self):
-        now = time.time()
-        refresh_period_s = float(getattr(self._manager.cfg, "status_proxy_refresh_s", 0.02))
-        if refresh_period_s < 0:
-            refresh_period_s = 0.0
-        if now - self._last_at > refresh_period_s:
-            latest = self._manager.get_status_snapshot()
-            if latest is None:
-                latest = self._manager.get_latest_status()
-            if latest is not None:
-                self._last = latest
-                self._last_at = now
+        seq = self._manager.status_sequence()
+        if seq == self._last_seq:
+            return
+        latest = self._manager.get_latest_status()
+        if latest is not None:
+            self._last = latest
+            self._last_seq = seq
+
+    def wait_for_update(self, timeout_s: float) -> bool:
+        """
+        Block until the cyclic process publishes its next status frame, or until
+        timeout. Returns True (with the cached frame refreshed) if one arrived.
+        """
+        if not self._manager.wait_for_status_update(timeout_s):
+            return False
+        self._refresh()
+        return True
 
     def get_field(self, slave_position: int, key: str):
+        if key in _SHM_FIELDS:
+            return self._manager.read_drive_field(slave_position, key)
         self._refresh()
         if not self._last:
             return None
         drive = self._last.drives.get(slave_position) or {}
-        result = drive.get(key)
-        if slave_position == 3 and key == 'dip_in_state':
-            import sys
-            sys.stdout.write(f"[CLIENT-DEBUG] Slave 3 get_field('dip_in_state'): result={result}, drive_keys={list(drive.keys())[:20]}\n")
-            sys.stdout.flush()
-        return result
+        return drive.get(key)
+
+
+def shared_status_proxy(manager: EtherCATProcessManager) -> StatusProxy:
+    """Return the manager's StatusProxy, creating it on first use, so every drive handle shares one cached frame."""
+    proxy = manager.status_proxy
+    if proxy is None:
+        proxy = StatusProxy(manager)
+        manager.status_proxy = proxy
+    return proxy
 
 
 def attach_drive_handle(
@@ -47,23 +65,44 @@ def attach_drive_handle(
     status_proxy: Optional[StatusProxy] = None,
 ) -> CiA402Drive:
     drive = CiA402Drive(slave_position=slave_position)
-    status = status_proxy or StatusProxy(manager)
+    status = status_proxy or shared_status_proxy(manager)
+
+    def enqueue(pos: int, cmd_type: CommandType, value, params: Optional[Dict]):
+        if params is None and cmd_type in RING_COMMAND_TYPES:
+            manager.send_setpoint(pos, cmd_type, value)
+        else:
+            manager.send_command(Command(target_id=pos, type=cmd_type, value=value, params=params))
 
-    def enqueue(pos: int, cmd_type: CommandType, value, params: Dict):
-        manager.send_command(Command(target_id=pos, type=cmd_type, value=value, params=params))
+    # Published fields resolve to a direct slot read; anything else goes through the proxy.
+    readers = {key: manager.drive_field_reader(slave_position, key) for key in _SHM_FIELDS}
 
     def read_status(pos: int, key: str):
+        reader = readers.get(key)
+        if reader is not None:
+            return reader()
         return status.get_field(pos, key)
 
-    drive._enqueue_command = enqueue  # type: ignore[attr-defined]
-    drive._read_status = read_status  # type: ignore[attr-defined]
+    drive._enqueue_command = enqueue
+    drive._read_status = read_status
+    drive._fast_set_csp = manager.csp_target_writer(slave_position)
+
+    # Features are fixed at bus scan; cache the first non-empty result and mirror it
+    # into drive.supports so probe checks stay a plain dict lookup. The cache lives
+    # with this handle, which EtherCATBus rebuilds on every start().
+    features_cache: Dict[str, bool] = {}
 
     def get_features():
+        if features_cache:
+            return features_cache
         latest = manager.get_status_snapshot()
         if latest is None:
             latest = manager.get_latest_status()
         if latest and latest.drives.get(slave_position):
-            return latest.drives[slave_position].get('features', {})
+            features = latest.drives[slave_position].get('features') or {}
+            if features:
+                features_cache.update(features)
+                drive.supports.update(features)
+                return features_cache
         return {}
 
     drive.get_features = get_features  # type: ignore[attr-defined]
@@ -82,7 +121,7 @@ class EtherCATBus:
     def start(self):
         self._manager = EtherCATProcessManager(self._config)
         self._manager.start()
-        self._status = StatusProxy(self._manager)
+        self._status = shared_status_proxy(self._manager)
         for slave_cfg in self._config.slaves:
             if slave_cfg.cia402:
                 drive = attach_drive_handle(
@@ -91,7 +130,7 @@ class EtherCATBus:
                     status_proxy=self._status,
                 )
                 self._drives[slave_cfg.position] = drive
-                self._logger.info(f"Attached drive at position {slave_cfg.position}")
+                self._logger.info("Attached drive at position %d", slave_cfg.position)
 
     def get_drive(self, position: int) -> Optional[CiA402Drive]:
         return self._drives.get(position)
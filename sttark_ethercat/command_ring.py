@@ -0,0 +1,175 @@
+"""
+Shared-memory command ring for the application -> cyclic process hot path.
+
+Single producer (EtherCATProcessManager.send_command, serialized by a lock in the
+application process) and single consumer (the EtherCATProcess main loop). Records
+are fixed size and only carry scalar set-point commands; anything with structured
+params keeps going through the pickled command queue.
+
+head/tail are free-running counters; the slot index is counter & RING_MASK.
+The producer writes the record before publishing head, the consumer reads the
+record before publishing tail, so neither side ever touches a slot the other
+one owns.
+
+Every command, ring or pipe, carries a sequence number taken from one counter
+under the producer's send lock. The consumer merges both channels by sequence
+(merge_in_order), so a set-point never overtakes a STOP_MOTION / DISABLE_DRIVE
+sent after it, nor lands before one sent ahead of it.
+"""
+
+import ctypes
+import multiprocessing as mp
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from .commands import COMMAND_CODES, COMMAND_TYPES_BY_CODE, Command, CommandType
+
+
+RING_SLOTS = 256  # must be a power of two
+RING_MASK = RING_SLOTS - 1
+# Upper bound on ring records consumed per cycle (in addition to the queue budget).
+# Records are coalesced before dispatch, so this bounds unpacking, not handler calls.
+RING_DRAIN_PER_CYCLE = 64
+
+# type code (CommandType.value), target_id, value, flags, sequence number
+_RECORD = struct.Struct("<IidiQ")
+RECORD_SIZE = _RECORD.size
+
+FLAG_VALUE_NONE = 0x1
+
+# Streaming set-points: the cyclic process only uses `value` for these. Their
+# ordering relative to queued commands matters (a STOP_MOTION must not be undone
+# by an older set-point), which is what the shared sequence number is for.
+RING_COMMAND_TYPES = frozenset((
+    CommandType.SET_POSITION_CSP,
+    CommandType.SET_VELOCITY,
+    CommandType.SET_TORQUE,
+))
+# Params the cyclic process ignores for ring commands (dropped on the ring path).
+_RING_IGNORED_PARAMS = frozenset(("unit",))
+
+
+def ring_eligible(cmd: Command) -> bool:
+    if cmd.type not in RING_COMMAND_TYPES or cmd.correlation_id is not None:
+        return False
+    return not cmd.params or cmd.params.keys() <= _RING_IGNORED_PARAMS
+
+
+class CommandRing:
+    def __init__(self):
+        self._records = mp.RawArray(ctypes.c_char, RING_SLOTS * RECORD_SIZE)
+        self._head = mp.RawValue(ctypes.c_uint64, 0)
+        self._tail = mp.RawValue(ctypes.c_uint64, 0)
+
+    def __len__(self) -> int:
+        return int(self._head.value - self._tail.value)
+
+    def mark(self) -> int:
+        """Producer position right now; pass it to drain(end=...) to bound a drain."""
+        return int(self._head.value)
+
+    # Producer side
+    def push(self, cmd_type: CommandType, target_id: int, value: Optional[Any], seq: int) -> bool:
+        head = self._head.value
+        if head - self._tail.value >= RING_SLOTS:
+            return False
+        if value is None:
+            _RECORD.pack_into(self._records, (head & RING_MASK) * RECORD_SIZE, COMMAND_CODES[cmd_type], target_id, 0.0, FLAG_VALUE_NONE, seq)
+        else:
+            _RECORD.pack_into(self._records, (head & RING_MASK) * RECORD_SIZE, COMMAND_CODES[cmd_type], target_id, float(value), 0, seq)
+        self._head.value = head + 1
+        return True
+
+    # Consumer side
+    def drain(self, limit: int = RING_DRAIN_PER_CYCLE, end: Optional[int] = None,
+              before_seq: Optional[int] = None) -> List[Tuple[int, Command]]:
+        """
+        Pop up to `limit` records, oldest first, as (seq, Command).
+
+        With neither bound, drains everything published. Otherwise a record is popped
+        while it lies before producer position `end` (see mark()) or its sequence
+        number is below `before_seq`; draining stops at the first record that is
+        neither, leaving it for a later drain.
+        """
+        out: List[Tuple[int, Command]] = []
+        records = self._records
+        tail = self._tail.value
+        stop = min(self._head.value, tail + limit)
+        if end is None and before_seq is None:
+            end = stop
+        while tail < stop:
+            code, target_id, value, flags, seq = _RECORD.unpack_from(records, (tail & RING_MASK) * RECORD_SIZE)
+            if (end is None or tail >= end) and (before_seq is None or seq >= before_seq):
+                break
+            out.append((seq, Command(
+                target_id=target_id,
+                type=COMMAND_TYPES_BY_CODE[code],
+                value=None if flags & FLAG_VALUE_NONE else value,
+            )))
+            tail += 1
+        self._tail.value = tail
+        return out
+
+
+def collect_in_order(cmd_conn: Any, cmd_ring: Optional[CommandRing],
+                     pipe_budget: int = 16) -> List[Tuple[int, Command]]:
+    """
+    Read up to `pipe_budget` (seq, Command) frames from `cmd_conn` plus the ring
+    records that belong with them, and return them merged in send order as
+    (seq, Command).
+
+    The ring is marked before the pipe is polled, so records published before the
+    poll are taken: any older pipe frame was already in the pipe and has been read.
+    Records published later are taken only if they are older than the newest frame
+    read. When the pipe budget runs out with frames still pending, only records
+    older than the last frame read are taken, since the unread frames may precede
+    the rest.
+    """
+    ring_end = cmd_ring.mark() if cmd_ring is not None else 0
+    queued: List[Tuple[int, Command]] = []
+    pipe_backlog = False
+    for _ in range(pipe_budget):
+        if not cmd_conn.poll():
+            break
+        queued.append(cmd_conn.recv())
+    else:
+        pipe_backlog = cmd_conn.poll()
+    ring: List[Tuple[int, Command]] = []
+    if cmd_ring is not None and len(cmd_ring):
+        last_seq = queued[-1][0] if queued else None
+        ring = cmd_ring.drain(
+            RING_DRAIN_PER_CYCLE, end=None if pipe_backlog else ring_end, before_seq=last_seq,
+        )
+    if not queued and not ring:
+        return []
+    return merge_in_order(queued, ring)
+
+
+def merge_in_order(queued: List[Tuple[int, Command]],
+                   ring: List[Tuple[int, Command]]) -> List[Tuple[int, Command]]:
+    """
+    Interleave (seq, Command) lists from the pipe and the ring, each already in order, by seq.
+
+    A run of ring set-points with no queued command between them is coalesced to one
+    Command per (target_id, type) carrying the newest value and seq, in first-seen order.
+    Coalescing never crosses a queued command: set-points sent before a STOP_MOTION or
+    DISABLE_DRIVE are dispatched ahead of it, and ones sent after it are not folded
+    into anything older.
+    """
+    if not ring:
+        return queued
+    out: List[Tuple[int, Command]] = []
+    pending: Dict[Tuple[int, CommandType], Tuple[int, Command]] = {}
+    qi = 0
+    n_queued = len(queued)
+    for seq, cmd in ring:
+        while qi < n_queued and queued[qi][0] < seq:
+            if pending:
+                out.extend(pending.values())
+                pending.clear()
+            out.append(queued[qi])
+            qi += 1
+        pending[(cmd.target_id, cmd.type)] = (seq, cmd)
+    out.extend(pending.values())
+    out.extend(queued[qi:])
+    return out
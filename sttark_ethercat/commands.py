@@ -1,6 +1,8 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from .compat import DATACLASS_SLOTS
 
 
 class CommandType(Enum):
@@ -49,13 +51,20 @@ class CommandType(Enum):
     WRITE_SDO = auto()
 
 
-@dataclass
+# Small-int command codes (CommandType.value) for hot paths that would otherwise
+# pay for Enum attribute access / Enum(value) lookups.
+COMMAND_CODES: Dict[CommandType, int] = {ct: ct.value for ct in CommandType}
+COMMAND_TYPES_BY_CODE: Tuple[Optional[CommandType], ...] = tuple(
+    next((ct for ct in CommandType if ct.value == code), None)
+    for code in range(max(COMMAND_CODES.values()) + 1)
+)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class Command:
     target_id: int
     type: CommandType
     value: Optional[Any] = None
-    params: Dict[str, Any] = field(default_factory=dict)
+    # None when the command carries no params (avoids an empty dict per command).
+    params: Optional[Dict[str, Any]] = None
     correlation_id: Optional[str] = None
-
-
-
@@ -0,0 +1,7 @@
+"""Python version compatibility switches shared across the package."""
+
+import sys
+
+
+# dataclass(slots=True) needs Python 3.10+; fall back to a regular dataclass on 3.9.
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
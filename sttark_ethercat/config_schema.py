@@ -1,8 +1,10 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Any
 
+from .compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class XmlConfig:
     """
     Configuration for parsing ESI XML to derive device-specific features and PDOs.
@@ -13,7 +15,7 @@ class XmlConfig:
     product_code: Optional[int] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PdoSelection:
     """
     Optional custom PDO mapping to override or augment ESI mappings.
@@ -24,7 +26,7 @@ class PdoSelection:
     custom_pdo_config: Optional[Dict[str, List[Tuple[int, int, int]]]] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class HomingConfig:
     method: Optional[int] = None
     search_vel: Optional[float] = None
@@ -34,7 +36,7 @@ class HomingConfig:
     unit: str = "native"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class UnitConversion:
     """
     Define conversion between drive pulses and user units.
@@ -44,7 +46,7 @@ class UnitConversion:
     scale_factor: Optional[float] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RuckigConfig:
     """
     Optional jerk-limited trajectory generation settings for CSP streaming.
@@ -64,7 +66,7 @@ class RuckigConfig:
     hold_last_commanded_position: bool = True
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DriveConfig:
     position: int
     alias: int = 0
@@ -106,7 +108,7 @@ class DriveConfig:
     pdo_read_sizes: Dict[Tuple[int, int], int] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class EthercatNetworkConfig:
     master_index: int
     network_interface: Optional[str] = None
@@ -152,6 +154,8 @@ class EthercatNetworkConfig:
     jitter_warmup_cycles: int = 0
     deadline_miss_threshold_ns: int = 0
     status_publish_period_s: float = 0.05
+    # Unused: StatusProxy now refreshes whenever a new actuals frame is published.
+    # Kept so existing configs keep loading.
     status_proxy_refresh_s: float = 0.02
     process_log_file: Optional[str] = None
     process_log_stderr: bool = True
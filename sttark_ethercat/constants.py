@@ -1,68 +1,314 @@
 """
 EtherCAT CiA 402 and device object dictionary constants.
 Avoid hard-coded hex values across the codebase.
+
+Every module-level name is annotated Final so type checkers treat it as a
+constant and flag rebinding. Hot paths import them by name
+(`from .constants import CW_INDEX`), which keeps every reference a plain
+module-global load. The enums (CoEIndex, Mode, CWFlag) group
+the same values for callers that want names; the module-level names stay plain
+ints so log output and byte packing are unchanged.
 """
 
+import binascii
+import struct
+from enum import IntEnum, IntFlag
+from types import MappingProxyType
+from typing import Final, FrozenSet, Mapping, Tuple
+
+__all__ = [
+    # Object indices
+    "CW_INDEX", "SW_INDEX", "MODES_OP_INDEX", "MODES_OP_DISPLAY_INDEX",
+    "TARGET_POSITION_INDEX", "TARGET_VELOCITY_INDEX", "TARGET_TORQUE_INDEX", "MAX_TORQUE_INDEX",
+    "POSITION_ACTUAL_INDEX", "VELOCITY_ACTUAL_INDEX", "TORQUE_ACTUAL_INDEX", "ERROR_CODE_INDEX",
+    "PROBE_FUNCTION_INDEX", "PROBE_STATUS_INDEX", "PROBE_POS1_INDEX", "PROBE_POS2_INDEX",
+    "PROBE_POS2_ALT_INDEX", "DIGITAL_INPUTS_INDEX", "DIP_IN_STATE_INDEX",
+    "CoEIndex", "PdoClass", "PDO_CLASS", "HOT_RT_INDICES", "PDO_ENTRY_STRUCTS",
+    # Modes of operation
+    "MODE_NO_MODE", "MODE_PP", "MODE_VL", "MODE_PV", "MODE_PT", "MODE_HM", "MODE_CSP", "MODE_CSV", "MODE_CST",
+    "Mode", "MODE_NAME", "MODE_FROM_NAME",
+    # Controlword
+    "CW_BIT_NEW_SET_POINT", "CW_BIT_CHANGE_IMMEDIATELY", "CW_BIT_ABS_REL", "CW_BIT_HALT",
+    "CW_ENABLE_OP_SIMPLIFIED", "CWFlag",
+    "CW_SHUTDOWN", "CW_SWITCH_ON", "CW_ENABLE_OPERATION", "CW_FAULT_RESET", "CW_NEXT", "next_cw",
+    # Statusword
+    "SW_BIT_FAULT", "SW_BIT_WARNING", "SW_BIT_TARGET_REACHED", "SW_BIT_INTERNAL_LIMIT_ACTIVE",
+    "SW_BIT_SETPOINT_ACK",
+    "SW_MASK_FAULT", "SW_MASK_WARNING", "SW_MASK_TARGET_REACHED", "SW_MASK_INTERNAL_LIMIT_ACTIVE",
+    "SW_MASK_SETPOINT_ACK",
+    "SW_STATE_MASK", "CiA402State", "SW_STATE_LUT", "cia402_state",
+    # Touch probe
+    "PROBE_FUNC_ENABLE_PROBE1", "PROBE_FUNC_PROBE1_POS_EDGE", "PROBE_FUNC_PROBE1_NEG_EDGE",
+    "PROBE1_ARM_POS", "PROBE1_ARM_NEG", "PROBE1_DISABLE", "PROBE_ARM_LUT",
+    # Diagnostics
+    "INDEX_NAME", "CONSTANTS_FINGERPRINT",
+]
+
 # Object indices (CoE)
-CW_INDEX = 0x6040  # Controlword
-SW_INDEX = 0x6041  # Statusword
+CW_INDEX: Final[int] = 0x6040  # Controlword
+SW_INDEX: Final[int] = 0x6041  # Statusword
 
-MODES_OP_INDEX = 0x6060             # Modes of operation (command)
-MODES_OP_DISPLAY_INDEX = 0x6061     # Modes of operation display (actual)
+MODES_OP_INDEX: Final[int] = 0x6060             # Modes of operation (command)
+MODES_OP_DISPLAY_INDEX: Final[int] = 0x6061     # Modes of operation display (actual)
 
-TARGET_POSITION_INDEX = 0x607A
-TARGET_VELOCITY_INDEX = 0x60FF
-TARGET_TORQUE_INDEX = 0x6071
-MAX_TORQUE_INDEX = 0x6072
+TARGET_POSITION_INDEX: Final[int] = 0x607A
+TARGET_VELOCITY_INDEX: Final[int] = 0x60FF
+TARGET_TORQUE_INDEX: Final[int] = 0x6071
+MAX_TORQUE_INDEX: Final[int] = 0x6072
 
-POSITION_ACTUAL_INDEX = 0x6064
-VELOCITY_ACTUAL_INDEX = 0x606C
-TORQUE_ACTUAL_INDEX = 0x6077
+POSITION_ACTUAL_INDEX: Final[int] = 0x6064
+VELOCITY_ACTUAL_INDEX: Final[int] = 0x606C
+TORQUE_ACTUAL_INDEX: Final[int] = 0x6077
 
-ERROR_CODE_INDEX = 0x603F
+ERROR_CODE_INDEX: Final[int] = 0x603F
 
 # Touch probe objects (drive-specific but common on some servos)
-PROBE_FUNCTION_INDEX = 0x60B8
-PROBE_STATUS_INDEX = 0x60B9
-PROBE_POS1_INDEX = 0x60BA
+PROBE_FUNCTION_INDEX: Final[int] = 0x60B8
+PROBE_STATUS_INDEX: Final[int] = 0x60B9
+PROBE_POS1_INDEX: Final[int] = 0x60BA
 # Note: some devices/ESIs use 0x60BB for the second captured position instead of 0x60BC.
 # The runtime supports both to avoid "silent" missing probe position reporting.
-PROBE_POS2_INDEX = 0x60BC
-PROBE_POS2_ALT_INDEX = 0x60BB
-DIGITAL_INPUTS_INDEX = 0x60FD
-DIP_IN_STATE_INDEX = 0x4020
+PROBE_POS2_INDEX: Final[int] = 0x60BC
+PROBE_POS2_ALT_INDEX: Final[int] = 0x60BB
+DIGITAL_INPUTS_INDEX: Final[int] = 0x60FD
+DIP_IN_STATE_INDEX: Final[int] = 0x4020
+
+
+class CoEIndex(IntEnum):
+    """The object indices above as an enum; members compare and hash as the plain ints."""
+
+    CW = CW_INDEX
+    SW = SW_INDEX
+    MODES_OP = MODES_OP_INDEX
+    MODES_OP_DISPLAY = MODES_OP_DISPLAY_INDEX
+    TARGET_POSITION = TARGET_POSITION_INDEX
+    TARGET_VELOCITY = TARGET_VELOCITY_INDEX
+    TARGET_TORQUE = TARGET_TORQUE_INDEX
+    MAX_TORQUE = MAX_TORQUE_INDEX
+    POSITION_ACTUAL = POSITION_ACTUAL_INDEX
+    VELOCITY_ACTUAL = VELOCITY_ACTUAL_INDEX
+    TORQUE_ACTUAL = TORQUE_ACTUAL_INDEX
+    ERROR_CODE = ERROR_CODE_INDEX
+    PROBE_FUNCTION = PROBE_FUNCTION_INDEX
+    PROBE_STATUS = PROBE_STATUS_INDEX
+    PROBE_POS1 = PROBE_POS1_INDEX
+    PROBE_POS2 = PROBE_POS2_INDEX
+    PROBE_POS2_ALT = PROBE_POS2_ALT_INDEX
+    DIGITAL_INPUTS = DIGITAL_INPUTS_INDEX
+    DIP_IN_STATE = DIP_IN_STATE_INDEX
+
+
+
+class PdoClass(IntEnum):
+    """How often an object needs to cross the bus, i.e. whether it earns a PDO slot."""
+
+    HOT_RT = 0       # read or written every cycle
+    WARM = 1         # changes on mode switches/faults/arming; SDO at a slower rate is enough
+    CONFIG_ONLY = 2  # set once at startup
+
+
+PDO_CLASS: Final[Mapping[int, PdoClass]] = MappingProxyType({
+    CW_INDEX: PdoClass.HOT_RT,
+    SW_INDEX: PdoClass.HOT_RT,
+    TARGET_POSITION_INDEX: PdoClass.HOT_RT,
+    TARGET_VELOCITY_INDEX: PdoClass.HOT_RT,
+    TARGET_TORQUE_INDEX: PdoClass.HOT_RT,
+    POSITION_ACTUAL_INDEX: PdoClass.HOT_RT,
+    VELOCITY_ACTUAL_INDEX: PdoClass.HOT_RT,
+    TORQUE_ACTUAL_INDEX: PdoClass.HOT_RT,
+    PROBE_STATUS_INDEX: PdoClass.HOT_RT,
+    PROBE_POS1_INDEX: PdoClass.HOT_RT,
+    PROBE_POS2_INDEX: PdoClass.HOT_RT,
+    PROBE_POS2_ALT_INDEX: PdoClass.HOT_RT,
+    DIGITAL_INPUTS_INDEX: PdoClass.HOT_RT,
+    MODES_OP_INDEX: PdoClass.WARM,
+    MODES_OP_DISPLAY_INDEX: PdoClass.WARM,
+    ERROR_CODE_INDEX: PdoClass.WARM,
+    PROBE_FUNCTION_INDEX: PdoClass.WARM,
+    DIP_IN_STATE_INDEX: PdoClass.WARM,
+    MAX_TORQUE_INDEX: PdoClass.CONFIG_ONLY,
+})
+HOT_RT_INDICES: Final[FrozenSet[int]] = frozenset(idx for idx, cls in PDO_CLASS.items() if cls == PdoClass.HOT_RT)
+
+# Wire formats (little-endian, as mapped in the process-data domain) of the actual-value
+# objects the cyclic process mirrors every cycle, keyed like register_pdo_entry_list offsets
+PDO_ENTRY_STRUCTS: Final[Mapping[Tuple[int, int], struct.Struct]] = MappingProxyType({
+    (POSITION_ACTUAL_INDEX, 0): struct.Struct("<i"),
+    (VELOCITY_ACTUAL_INDEX, 0): struct.Struct("<i"),
+    (TORQUE_ACTUAL_INDEX, 0): struct.Struct("<h"),
+    (MODES_OP_DISPLAY_INDEX, 0): struct.Struct("<B"),
+    (ERROR_CODE_INDEX, 0): struct.Struct("<H"),
+    (DIGITAL_INPUTS_INDEX, 0): struct.Struct("<I"),
+    (DIP_IN_STATE_INDEX, 1): struct.Struct("<I"),
+})
 
 # Modes of operation values (CiA 402)
-MODE_NO_MODE = 0
-MODE_PP = 1
-MODE_VL = 2
-MODE_PV = 3
-MODE_PT = 4
-MODE_HM = 6
-MODE_CSP = 8
-MODE_CSV = 9
-MODE_CST = 10
+MODE_NO_MODE: Final[int] = 0
+MODE_PP: Final[int] = 1
+MODE_VL: Final[int] = 2
+MODE_PV: Final[int] = 3
+MODE_PT: Final[int] = 4
+MODE_HM: Final[int] = 6
+MODE_CSP: Final[int] = 8
+MODE_CSV: Final[int] = 9
+MODE_CST: Final[int] = 10
+
+
+class Mode(IntEnum):
+    """Modes of operation values as an enum, for decoding 0x6060/0x6061 in diagnostics."""
+
+    NO_MODE = MODE_NO_MODE
+    PP = MODE_PP
+    VL = MODE_VL
+    PV = MODE_PV
+    PT = MODE_PT
+    HM = MODE_HM
+    CSP = MODE_CSP
+    CSV = MODE_CSV
+    CST = MODE_CST
+
 
 # Controlword bits/masks (simplified for maintenance)
-CW_BIT_NEW_SET_POINT = 4  # PP set-point bit (also used by some drives for homing start in MODE_HM)
-CW_BIT_CHANGE_IMMEDIATELY = 5  # PP: "change immediately"
-CW_BIT_ABS_REL = 6  # PP: 0=absolute, 1=relative
-CW_BIT_HALT = 8  # Halt (0x0100)
+CW_BIT_NEW_SET_POINT: Final[int] = 4  # PP set-point bit (also used by some drives for homing start in MODE_HM)
+CW_BIT_CHANGE_IMMEDIATELY: Final[int] = 5  # PP: "change immediately"
+CW_BIT_ABS_REL: Final[int] = 6  # PP: 0=absolute, 1=relative
+CW_BIT_HALT: Final[int] = 8  # Halt (0x0100)
 
 # Commonly used masks for enabling operation (simplified sequence)
-CW_ENABLE_OP_SIMPLIFIED = 0x000F
+CW_ENABLE_OP_SIMPLIFIED: Final[int] = 0x000F
+
+
+class CWFlag(IntFlag):
+    """Controlword bits above as masks, for building and decoding controlwords outside the cycle."""
+
+    NEW_SET_POINT = 1 << CW_BIT_NEW_SET_POINT
+    CHANGE_IMMEDIATELY = 1 << CW_BIT_CHANGE_IMMEDIATELY
+    ABS_REL = 1 << CW_BIT_ABS_REL
+    HALT = 1 << CW_BIT_HALT
+    ENABLE_OP_SIMPLIFIED = CW_ENABLE_OP_SIMPLIFIED
 
 # Statusword bits (0x6041) - commonly used semantics
-SW_BIT_FAULT = 3
-SW_BIT_WARNING = 7
-SW_BIT_TARGET_REACHED = 10
-SW_BIT_INTERNAL_LIMIT_ACTIVE = 11
-SW_BIT_SETPOINT_ACK = 12  # commonly "set-point acknowledged" for PP/PV on many drives
+SW_BIT_FAULT: Final[int] = 3
+SW_BIT_WARNING: Final[int] = 7
+SW_BIT_TARGET_REACHED: Final[int] = 10
+SW_BIT_INTERNAL_LIMIT_ACTIVE: Final[int] = 11
+SW_BIT_SETPOINT_ACK: Final[int] = 12  # commonly "set-point acknowledged" for PP/PV on many drives
+
+# Statusword single-bit masks, so callers test `sw & SW_MASK_*` instead of shifting per read
+SW_MASK_FAULT: Final[int] = 1 << SW_BIT_FAULT                                   # 0x0008
+SW_MASK_WARNING: Final[int] = 1 << SW_BIT_WARNING                               # 0x0080
+SW_MASK_TARGET_REACHED: Final[int] = 1 << SW_BIT_TARGET_REACHED                 # 0x0400
+SW_MASK_INTERNAL_LIMIT_ACTIVE: Final[int] = 1 << SW_BIT_INTERNAL_LIMIT_ACTIVE   # 0x0800
+SW_MASK_SETPOINT_ACK: Final[int] = 1 << SW_BIT_SETPOINT_ACK                     # 0x1000
+
+# CiA 402 state machine decode. SW_STATE_MASK covers the bits that define the state
+# (0-3, 5, 6); SW_STATE_LUT maps `sw & 0x7F` straight to a CiA402State value.
+SW_STATE_MASK: Final[int] = 0x006F
+
+
+class CiA402State(IntEnum):
+    NOT_READY_TO_SWITCH_ON = 0
+    SWITCH_ON_DISABLED = 1
+    READY_TO_SWITCH_ON = 2
+    SWITCHED_ON = 3
+    OPERATION_ENABLED = 4
+    QUICK_STOP_ACTIVE = 5
+    FAULT_REACTION_ACTIVE = 6
+    FAULT = 7
+    UNKNOWN = 8
+
+
+def _classify_statusword(sw: int) -> int:
+    if (sw & 0x4F) == 0x00:
+        return CiA402State.NOT_READY_TO_SWITCH_ON
+    if (sw & 0x4F) == 0x40:
+        return CiA402State.SWITCH_ON_DISABLED
+    if (sw & 0x6F) == 0x21:
+        return CiA402State.READY_TO_SWITCH_ON
+    if (sw & 0x6F) == 0x23:
+        return CiA402State.SWITCHED_ON
+    if (sw & 0x6F) == 0x27:
+        return CiA402State.OPERATION_ENABLED
+    if (sw & 0x6F) == 0x07:
+        return CiA402State.QUICK_STOP_ACTIVE
+    if (sw & 0x4F) == 0x0F:
+        return CiA402State.FAULT_REACTION_ACTIVE
+    if (sw & 0x4F) == 0x08:
+        return CiA402State.FAULT
+    return CiA402State.UNKNOWN
+
+
+SW_STATE_LUT: Final[bytes] = bytes(_classify_statusword(i) for i in range(128))
+
+
+def cia402_state(sw: int) -> int:
+    """Decode the CiA 402 state from a statusword with one table lookup."""
+    return SW_STATE_LUT[sw & 0x7F]
+
+
+# Controlword commands for the enable sequence (CiA 402 device control)
+CW_SHUTDOWN: Final[int] = 0x0006
+CW_SWITCH_ON: Final[int] = 0x0007
+CW_ENABLE_OPERATION: Final[int] = 0x000F
+CW_FAULT_RESET: Final[int] = 0x0080
+
+# Controlword that advances each CiA402State one step towards OPERATION_ENABLED
+# (and holds it there), indexed by state. UNKNOWN falls back to SHUTDOWN.
+CW_NEXT: Final[Tuple[int, ...]] = (
+    CW_SHUTDOWN,            # NOT_READY_TO_SWITCH_ON
+    CW_SHUTDOWN,            # SWITCH_ON_DISABLED
+    CW_SWITCH_ON,           # READY_TO_SWITCH_ON
+    CW_ENABLE_OPERATION,    # SWITCHED_ON
+    CW_ENABLE_OPERATION,    # OPERATION_ENABLED
+    CW_ENABLE_OPERATION,    # QUICK_STOP_ACTIVE
+    CW_FAULT_RESET,         # FAULT_REACTION_ACTIVE
+    CW_FAULT_RESET,         # FAULT
+    CW_SHUTDOWN,            # UNKNOWN
+)
+
+
+def next_cw(sw: int) -> int:
+    """Controlword that moves a drive reporting `sw` one step towards OPERATION_ENABLED."""
+    return CW_NEXT[SW_STATE_LUT[sw & 0x7F]]
+
 
 # Probe function bits (example for some drives)
-PROBE_FUNC_ENABLE_PROBE1 = 0x0001
-PROBE_FUNC_PROBE1_POS_EDGE = 0x0004
-PROBE_FUNC_PROBE1_NEG_EDGE = 0x0008
+PROBE_FUNC_ENABLE_PROBE1: Final[int] = 0x0001
+PROBE_FUNC_PROBE1_POS_EDGE: Final[int] = 0x0004
+PROBE_FUNC_PROBE1_NEG_EDGE: Final[int] = 0x0008
+
+# Complete 0x60B8 words for arming/disarming probe 1
+PROBE1_ARM_POS: Final[int] = PROBE_FUNC_ENABLE_PROBE1 | PROBE_FUNC_PROBE1_POS_EDGE  # 0x0005
+PROBE1_ARM_NEG: Final[int] = PROBE_FUNC_ENABLE_PROBE1 | PROBE_FUNC_PROBE1_NEG_EDGE  # 0x0009
+PROBE1_DISABLE: Final[int] = 0x0000
+# Edge name -> probe 1 arm word
+PROBE_ARM_LUT: Final[Mapping[str, int]] = MappingProxyType({
+    "positive": PROBE1_ARM_POS,
+    "rising": PROBE1_ARM_POS,
+    "negative": PROBE1_ARM_NEG,
+    "falling": PROBE1_ARM_NEG,
+})
+
+# Read-only value -> name tables for diagnostics (log lines, status dumps)
+INDEX_NAME: Final[Mapping[int, str]] = MappingProxyType({int(m): m.name for m in CoEIndex})
+MODE_NAME: Final[Mapping[int, str]] = MappingProxyType({int(m): m.name for m in Mode})
+# Lower-case mode name -> value, for selecting a mode from text ("pp", "csp", ...)
+MODE_FROM_NAME: Final[Mapping[str, int]] = MappingProxyType({m.name.lower(): int(m) for m in Mode if m != Mode.NO_MODE})
+
 
+def _fingerprint_bytes() -> bytes:
+    """Deterministic serialization of the integer constants and decode tables above."""
+    parts = [
+        name.encode("ascii") + b"=" + value.to_bytes(4, "little", signed=True)
+        for name, value in sorted(globals().items())
+        if name.isupper() and name != "CONSTANTS_FINGERPRINT"
+        and isinstance(value, int) and not isinstance(value, bool)
+    ]
+    parts.append(b"SW_STATE_LUT=" + SW_STATE_LUT)
+    parts.append(b"CW_NEXT=" + b"".join(cw.to_bytes(2, "little") for cw in CW_NEXT))
+    return b"\n".join(parts)
 
 
+# CRC-16/CCITT-FALSE of the constants above; changes whenever any value changes, so
+# caches derived from these constants (e.g. decoded PDO layouts) can key on it.
+CONSTANTS_FINGERPRINT: Final[int] = binascii.crc_hqx(_fingerprint_bytes(), 0xFFFF)
@@ -11,14 +11,16 @@ No adapter layer. No dependency on SttarkStandardLibrary / pyethercat.
 
 import ctypes
 import ctypes.util
+import functools
 import logging
 import os
 import shutil
+import struct
 import subprocess
 import time
 import threading
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Callable, Union
+from typing import Optional, Tuple, Dict, Callable, List, Union
 
 
 logger = logging.getLogger(__name__)
@@ -97,6 +99,67 @@ class ec_slave_config_t(ctypes.Structure):
     pass
 
 
+def _noop(*_args) -> None:
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _fuser_path() -> Optional[str]:
+    return shutil.which("fuser")
+
+
+def _run_quiet(argv: List[str]) -> None:
+    """Run `argv` (argv[0] an absolute path) with stdout/stderr to /dev/null and wait for it."""
+    if not hasattr(os, "posix_spawn"):
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        return
+    pid = os.posix_spawn(argv[0], argv, os.environ, file_actions=[
+        (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+    ])
+    os.waitpid(pid, 0)
+
+
+def _device_holder_pids(device_path: str) -> Optional[List[int]]:
+    """PIDs that have `device_path` open, from /proc/*/fd; None if that cannot be determined."""
+    try:
+        target = os.path.realpath(device_path)
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    holders = []
+    for name in entries:
+        if not name.isdigit():
+            continue
+        fd_dir = f"/proc/{name}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except FileNotFoundError:
+            continue
+        except OSError:
+            return None
+        for fd in fds:
+            try:
+                if os.readlink(f"{fd_dir}/{fd}") == target:
+                    holders.append(int(name))
+                    break
+            except OSError:
+                continue
+    return holders
+
+
+@functools.lru_cache(maxsize=None)
+def _struct(fmt: str) -> struct.Struct:
+    return struct.Struct(fmt)
+
+
+def _u8_array(data) -> ctypes.Array:
+    """Copy `data` into a new c_uint8 array with a single memcpy."""
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data)
+    return (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
+
+
 class ec_domain_t(ctypes.Structure):
     """Opaque domain handle."""
     pass
@@ -121,6 +184,11 @@ class ec_pdo_entry_reg_t(ctypes.Structure):
     ]
 
 
+# Same layout as ec_pdo_entry_reg_t (native alignment), for packing whole entries at once.
+_PDO_ENTRY_REG = struct.Struct("HHIIHBPP")
+assert _PDO_ENTRY_REG.size == ctypes.sizeof(ec_pdo_entry_reg_t)
+
+
 class ec_pdo_entry_info_t(ctypes.Structure):
     """PDO entry configuration structure."""
     _fields_ = [
@@ -150,6 +218,10 @@ class ec_sync_info_t(ctypes.Structure):
     ]
 
 
+# Terminator of the sync_info list passed to ecrt_slave_config_pdos().
+_SYNC_TERMINATOR = ec_sync_info_t(index=0xFF, dir=0, n_pdos=0, pdos=None, watchdog_mode=0)
+
+
 class ec_domain_state_t(ctypes.Structure):
     _fields_ = [
         ("working_counter", ctypes.c_uint),
@@ -255,7 +327,12 @@ if _libec:
     _libec.ecrt_master_create_domain.restype = ctypes.POINTER(ec_domain_t)
 
     _libec.ecrt_domain_data.argtypes = [ctypes.POINTER(ec_domain_t)]
-    _libec.ecrt_domain_data.restype = ctypes.POINTER(ctypes.c_uint8)
+    # Plain int address: nothing dereferences it from Python, so skip the POINTER object.
+    _libec.ecrt_domain_data.restype = ctypes.c_void_p
+
+    if hasattr(_libec, "ecrt_domain_size"):
+        _libec.ecrt_domain_size.argtypes = [ctypes.POINTER(ec_domain_t)]
+        _libec.ecrt_domain_size.restype = ctypes.c_size_t
 
     _libec.ecrt_domain_process.argtypes = [ctypes.POINTER(ec_domain_t)]
     _libec.ecrt_domain_process.restype = ctypes.c_int
@@ -454,7 +531,7 @@ class SdoRequest:
         buf = _libec.ecrt_sdo_request_data(self._req)
         if not bool(buf):
             return b""
-        return bytes(ctypes.cast(buf, ctypes.POINTER(ctypes.c_uint8 * size)).contents)
+        return ctypes.string_at(buf, size)
 
 
 class SlaveConfig:
@@ -544,6 +621,52 @@ class SlaveConfig:
             return False
 
 
+class SnapshotRing:
+    """
+    Fixed-stride ring of process-data snapshots, single producer / single consumer.
+
+    The producer (the cyclic thread) copies a domain window into the next slot
+    and only then publishes head; the consumer reads the slot before publishing
+    tail. head/tail are free-running counters (slot = counter & mask) and are
+    plain ints, whose stores are atomic under the GIL, so neither side locks.
+    A full ring rejects the push instead of blocking the cyclic thread.
+    """
+
+    def __init__(self, stride: int, slots: int = 64) -> None:
+        if stride <= 0:
+            raise ValueError(f"Snapshot stride must be positive, got {stride}")
+        if slots <= 0 or slots & (slots - 1):
+            raise ValueError(f"Snapshot slot count must be a power of two, got {slots}")
+        self.stride = int(stride)
+        self.slots = int(slots)
+        self._mask = self.slots - 1
+        self._buf = (ctypes.c_uint8 * (self.stride * self.slots))()
+        self._base = ctypes.addressof(self._buf)
+        self._head = 0
+        self._tail = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def push_from(self, src_addr: int) -> bool:
+        head = self._head
+        if head - self._tail >= self.slots:
+            self.dropped += 1
+            return False
+        ctypes.memmove(self._base + (head & self._mask) * self.stride, src_addr, self.stride)
+        self._head = head + 1
+        return True
+
+    def pop(self) -> Optional[bytes]:
+        tail = self._tail
+        if tail == self._head:
+            return None
+        snapshot = ctypes.string_at(self._base + (tail & self._mask) * self.stride, self.stride)
+        self._tail = tail + 1
+        return snapshot
+
+
 class Master:
     def __init__(self, master_index: int = 0):
         if _libec is None:
@@ -556,6 +679,26 @@ class Master:
         # Keep ctypes-owned storage alive for the lifetime of this Master.
         # IgH is sensitive to pointer lifetimes in registration structs.
         self._pdo_reg_keepalive = []
+        # id(domain) -> (domain, [(registration row, offset c_uint)]) waiting for
+        # flush_pdo_registrations(). ctypes pointers are unhashable, hence id().
+        self._pending_regs = {}
+        # id(domain) -> base address / writable byte view of its process data, for
+        # domains from create_domain() (kept alive in _domains, so the id is stable).
+        # IgH keeps the pointer stable while activated; both are dropped on deactivate().
+        self._domain_base = {}
+        self._domain_views = {}
+        # id(domain) -> domain contents at the last changed_ranges() call
+        self._domain_shadow = {}
+        # Reused out-parameters: id(domain) -> (ec_domain_state_t, pointer to it), and
+        # the master/slave info structs (every field is copied out before returning).
+        self._domain_state_bufs = {}
+        self._master_info = ec_master_info_t()
+        self._slave_info = ec_slave_info_t()
+        self._unbind_cyclic()
+        self._snapshot_ring: Optional[SnapshotRing] = None
+        # Per-thread sdo_upload scratch (buffer, result size, abort code); the
+        # async helpers upload from worker threads, and ctypes drops the GIL.
+        self._sdo_scratch = threading.local()
 
     def _force_release_device(self, device_path: str, sigterm_first: bool = True) -> None:
         """
@@ -566,24 +709,24 @@ class Master:
         """
         if not device_path:
             return
-        if not shutil.which("fuser"):
+        fuser = _fuser_path()
+        if not fuser:
             logger.warning("Cannot force-release EtherCAT device: `fuser` not found in PATH")
             return
+        # Nobody has the node open: nothing to kill, skip the fork+exec of fuser.
+        if _device_holder_pids(device_path) == []:
+            logger.info(f"No process holds {device_path}; skipping force-release")
+            return
 
         # `fuser -k` sends a signal to processes using the file. Prefer TERM then KILL.
         cmds = []
         if sigterm_first:
-            cmds.append(["fuser", "-k", "-TERM", device_path])
-        cmds.append(["fuser", "-k", "-KILL", device_path])
+            cmds.append([fuser, "-k", "-TERM", device_path])
+        cmds.append([fuser, "-k", "-KILL", device_path])
 
         for cmd in cmds:
             try:
-                subprocess.run(
-                    cmd,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    check=False,
-                )
+                _run_quiet(cmd)
             except Exception as e:
                 logger.warning(f"Force-release step failed for {device_path}: {e}")
 
@@ -594,11 +737,12 @@ class Master:
         """
         if not device_path:
             return ""
-        if not shutil.which("fuser"):
+        fuser = _fuser_path()
+        if not fuser:
             return ""
         try:
             cp = subprocess.run(
-                ["fuser", "-v", device_path],
+                [fuser, "-v", device_path],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 text=True,
@@ -675,6 +819,8 @@ class Master:
         if not domain:
             raise MasterException("Failed to create domain")
         self._domains.append(domain)
+        state = ec_domain_state_t()
+        self._domain_state_bufs[id(domain)] = (state, ctypes.pointer(state))
         return domain
 
     def config_slave(self, alias: int, position: int, vendor_id: int, product_code: int) -> SlaveConfig:
@@ -696,58 +842,75 @@ class Master:
 
     def register_pdo_entry(self, domain, alias: int, position: int, vendor_id: int,
                            product_code: int, index: int, subindex: int) -> Optional[int]:
-        offset = ctypes.c_uint()
-        bit_position = ctypes.c_uint()
-        reg = ec_pdo_entry_reg_t()
-        reg.alias = alias
-        reg.position = position
-        reg.vendor_id = vendor_id
-        reg.product_code = product_code
-        reg.index = index
-        reg.subindex = subindex
-        reg.offset = ctypes.pointer(offset)
-        reg.bit_position = ctypes.pointer(bit_position)
-        reg_array = (ec_pdo_entry_reg_t * 2)()
-        reg_array[0] = reg
-        result = _libec.ecrt_domain_reg_pdo_entry_list(domain, reg_array)
-        if result != 0:
-            logger.error(f"Failed to register PDO entry 0x{index:04X}:{subindex}, result={result}")
-            return None
-        # Keepalive (conservative): retain the array + pointed-to vars.
-        self._pdo_reg_keepalive.append((reg_array, offset, bit_position))
-        return offset.value
+        """
+        Register a single PDO entry and return its byte offset.
+
+        Kept for compatibility; each call is one IgH registration array. Prefer
+        `register_pdo_entry_list()` or `stage_pdo_entry()` + `flush_pdo_registrations()`.
+        """
+        offsets = self.register_pdo_entry_list(
+            domain, alias, position, vendor_id, product_code, [(index, subindex)])
+        return offsets.get((index, subindex))
 
     def register_pdo_entry_list(self, domain, alias: int, position: int, vendor_id: int,
                                 product_code: int, entries: list) -> Dict[Tuple[int, int], int]:
         if not entries:
             return {}
-        reg_array = (ec_pdo_entry_reg_t * (len(entries) + 1))()
-        offset_vars = []
-        bit_pos_vars = []
-        for i, (index, subindex) in enumerate(entries):
-            offset_var = ctypes.c_uint()
-            bit_pos_var = ctypes.c_uint()
-            offset_vars.append(offset_var)
-            bit_pos_vars.append(bit_pos_var)
-            reg_array[i].alias = alias
-            reg_array[i].position = position
-            reg_array[i].vendor_id = vendor_id
-            reg_array[i].product_code = product_code
-            reg_array[i].index = index
-            reg_array[i].subindex = subindex
-            reg_array[i].offset = ctypes.pointer(offset_var)
-            reg_array[i].bit_position = ctypes.pointer(bit_pos_var)
-        result = _libec.ecrt_domain_reg_pdo_entry_list(domain, reg_array)
-        if result != 0:
-            logger.error(f"Bulk PDO registration failed: {result}")
+        rows = [(alias, position, vendor_id, product_code, index, subindex)
+                for index, subindex in entries]
+        offset_vars = [ctypes.c_uint() for _ in rows]
+        if not self._reg_pdo_entries(domain, rows, offset_vars):
+            logger.error(f"Bulk PDO registration failed for slave {position}")
             return {}
-        # Keepalive (conservative): retain the array + pointed-to vars.
-        self._pdo_reg_keepalive.append((reg_array, offset_vars, bit_pos_vars))
         offsets = {}
         for i, (index, subindex) in enumerate(entries):
             offsets[(index, subindex)] = offset_vars[i].value
         return offsets
 
+    def stage_pdo_entry(self, domain, alias: int, position: int, vendor_id: int,
+                        product_code: int, index: int, subindex: int) -> ctypes.c_uint:
+        """
+        Queue a PDO entry for `flush_pdo_registrations()` instead of registering it now.
+
+        Returns the `c_uint` IgH writes the byte offset into; its `.value` is only
+        meaningful after the flush succeeded. Pending entries are flushed by
+        `activate()` at the latest.
+        """
+        offset_var = ctypes.c_uint()
+        self._pending_regs.setdefault(id(domain), (domain, []))[1].append(
+            ((alias, position, vendor_id, product_code, index, subindex), offset_var))
+        return offset_var
+
+    def flush_pdo_registrations(self, domain) -> bool:
+        """Register every entry staged for `domain` with one IgH call."""
+        _, pending = self._pending_regs.pop(id(domain), (None, None))
+        if not pending:
+            return True
+        rows = [row for row, _ in pending]
+        offset_vars = [offset_var for _, offset_var in pending]
+        if not self._reg_pdo_entries(domain, rows, offset_vars):
+            logger.error(f"Staged PDO registration failed ({len(rows)} entries)")
+            return False
+        return True
+
+    def _reg_pdo_entries(self, domain, rows: list, offset_vars: list) -> bool:
+        # One zero-terminated array per batch; IgH fills offset_vars in place.
+        reg_array = (ec_pdo_entry_reg_t * (len(rows) + 1))()
+        bit_pos_vars = [ctypes.c_uint() for _ in rows]
+        pack_into = _PDO_ENTRY_REG.pack_into
+        stride = _PDO_ENTRY_REG.size
+        addressof = ctypes.addressof
+        for i, row in enumerate(rows):
+            pack_into(reg_array, i * stride, *row,
+                      addressof(offset_vars[i]), addressof(bit_pos_vars[i]))
+        result = _libec.ecrt_domain_reg_pdo_entry_list(domain, reg_array)
+        if result != 0:
+            logger.error(f"ecrt_domain_reg_pdo_entry_list failed: {result}")
+            return False
+        # Keepalive (conservative): retain the array + pointed-to vars.
+        self._pdo_reg_keepalive.append((reg_array, offset_vars, bit_pos_vars))
+        return True
+
     def configure_slave_pdos(self, slave_config: SlaveConfig, sync_configs: list) -> bool:
         if not slave_config._config_handle:
             raise MasterException("Slave not configured")
@@ -778,11 +941,7 @@ class Master:
         sync_array = (ec_sync_info_t * (len(sync_infos) + 1))()
         for i, (sync_info, _, _) in enumerate(sync_infos):
             sync_array[i] = sync_info
-        sync_array[len(sync_infos)].index = 0xFF
-        sync_array[len(sync_infos)].dir = 0
-        sync_array[len(sync_infos)].n_pdos = 0
-        sync_array[len(sync_infos)].pdos = None
-        sync_array[len(sync_infos)].watchdog_mode = 0
+        sync_array[len(sync_infos)] = _SYNC_TERMINATOR
         result = _libec.ecrt_slave_config_pdos(
             slave_config._config_handle,
             len(sync_infos),
@@ -798,7 +957,7 @@ class Master:
     def slave_config_sdo(self, slave_config: SlaveConfig, index: int, subindex: int, data: bytes) -> bool:
         if not slave_config._config_handle:
             raise MasterException("Slave not configured")
-        data_array = (ctypes.c_uint8 * len(data))(*data)
+        data_array = _u8_array(data)
         result = _libec.ecrt_slave_config_sdo(
             slave_config._config_handle,
             index,
@@ -811,6 +970,25 @@ class Master:
                 f"Failed to register SDO config: index=0x{index:04X}, subindex={subindex}, result={result}")
         return True
 
+    def slave_config_sdo_batch(self, slave_config: SlaveConfig, sdos: list) -> bool:
+        """
+        `slave_config_sdo()` for a list of `(index, subindex, data)`.
+
+        All C buffers are built first, then the IgH calls are issued back-to-back.
+        Raises on the first rejected entry, like `slave_config_sdo()`.
+        """
+        handle = slave_config._config_handle
+        if not handle:
+            raise MasterException("Slave not configured")
+        staged = [(index, subindex, _u8_array(data)) for index, subindex, data in sdos]
+        config_sdo = _libec.ecrt_slave_config_sdo
+        for index, subindex, data_array in staged:
+            result = config_sdo(handle, index, subindex, data_array, len(data_array))
+            if result != 0:
+                raise MasterException(
+                    f"Failed to register SDO config: index=0x{index:04X}, subindex={subindex}, result={result}")
+        return True
+
     def slave_config_watchdog(self, slave_config: SlaveConfig, watchdog_divider: int, watchdog_intervals: int) -> bool:
         """
         Configure the slave ESC SyncManager watchdog times (registers 0x0400, 0x0420).
@@ -843,16 +1021,45 @@ class Master:
             raise MasterException("Master not requested")
         if self._activated:
             return True
+        for domain, _ in list(self._pending_regs.values()):
+            if not self.flush_pdo_registrations(domain):
+                raise MasterException("Failed to register staged PDO entries")
         result = _libec.ecrt_master_activate(self._master_handle)
         if result != 0:
             raise MasterException(f"Failed to activate master: {result}")
         self._activated = True
+        self._bind_cyclic()
+        for domain in self._domains:
+            self._domain_address(domain)
         return True
 
+    def _bind_cyclic(self) -> None:
+        # Cyclic calls go straight to libethercat with the handle pre-bound,
+        # skipping the module-global lookup and the activation checks per tick.
+        handle = self._master_handle
+        self._c_send = functools.partial(_libec.ecrt_master_send, handle)
+        self._c_receive = functools.partial(_libec.ecrt_master_receive, handle)
+        self._c_sync_reference_clock = functools.partial(_libec.ecrt_master_sync_reference_clock, handle)
+        self._c_sync_slave_clocks = functools.partial(_libec.ecrt_master_sync_slave_clocks, handle)
+        self._c_domain_process = _libec.ecrt_domain_process
+        self._c_domain_queue = _libec.ecrt_domain_queue
+
+    def _unbind_cyclic(self) -> None:
+        self._c_send = _noop
+        self._c_receive = _noop
+        self._c_sync_reference_clock = _noop
+        self._c_sync_slave_clocks = _noop
+        self._c_domain_process = _noop
+        self._c_domain_queue = _noop
+
     def deactivate(self):
         if self._master_handle and self._activated:
             _libec.ecrt_master_deactivate(self._master_handle)
             self._activated = False
+            self._unbind_cyclic()
+            self._domain_base.clear()
+            self._domain_views.clear()
+            self._domain_shadow.clear()
 
     def set_application_time(self, time_ns: int):
         if not self._master_handle:
@@ -876,12 +1083,10 @@ class Master:
             return False
 
     def sync_reference_clock(self):
-        if self._master_handle and self._activated:
-            _libec.ecrt_master_sync_reference_clock(self._master_handle)
+        self._c_sync_reference_clock()
 
     def sync_slave_clocks(self):
-        if self._master_handle and self._activated:
-            _libec.ecrt_master_sync_slave_clocks(self._master_handle)
+        self._c_sync_slave_clocks()
 
     def reference_clock_time_32(self) -> Optional[int]:
         """
@@ -914,7 +1119,7 @@ class Master:
     def get_slave_count(self) -> int:
         if not self._master_handle:
             raise MasterException("Master not requested")
-        info = ec_master_info_t()
+        info = self._master_info
         result = _libec.ecrt_master(self._master_handle, ctypes.byref(info))
         if result != 0:
             raise MasterException(f"Failed to get master info: {result}")
@@ -923,7 +1128,7 @@ class Master:
     def get_slave_info(self, position: int) -> Optional[dict]:
         if not self._master_handle:
             raise MasterException("Master not requested")
-        info = ec_slave_info_t()
+        info = self._slave_info
         result = _libec.ecrt_master_get_slave(
             self._master_handle,
             position,
@@ -949,7 +1154,7 @@ class Master:
         if not self._master_handle:
             raise MasterException("Master not requested")
         abort_code = ctypes.c_uint32(0)
-        data_array = (ctypes.c_uint8 * len(data))(*data)
+        data_array = _u8_array(data)
         result = _libec.ecrt_master_sdo_download(
             self._master_handle,
             slave_position,
@@ -971,9 +1176,16 @@ class Master:
                    max_size: int = 4) -> Optional[bytes]:
         if not self._master_handle:
             raise MasterException("Master not requested")
-        buffer = (ctypes.c_uint8 * max_size)()
-        result_size = ctypes.c_size_t(0)
-        abort_code = ctypes.c_uint32(0)
+        scratch = self._sdo_scratch
+        buffer = getattr(scratch, "buffer", None)
+        if buffer is None or len(buffer) < max_size:
+            buffer = scratch.buffer = (ctypes.c_uint8 * max(max_size, 1024))()
+            scratch.result_size = ctypes.c_size_t(0)
+            scratch.abort_code = ctypes.c_uint32(0)
+        result_size = scratch.result_size
+        abort_code = scratch.abort_code
+        result_size.value = 0
+        abort_code.value = 0
         result = _libec.ecrt_master_sdo_upload(
             self._master_handle,
             slave_position,
@@ -990,7 +1202,7 @@ class Master:
                 f"index=0x{index:04X}, subindex={subindex}, "
                 f"abort_code=0x{abort_code.value:08X}"
             )
-        return bytes(buffer[:result_size.value])
+        return ctypes.string_at(buffer, min(result_size.value, max_size))
 
     def sdo_upload_async(self, slave_position: int, index: int, subindex: int,
                          max_size: int = 4, timeout_s: float = 2.0,
@@ -1091,38 +1303,70 @@ class Master:
         spawn_thread.start()
 
     def send(self):
-        if self._master_handle and self._activated:
-            _libec.ecrt_master_send(self._master_handle)
+        self._c_send()
 
     def receive(self):
-        if self._master_handle and self._activated:
-            _libec.ecrt_master_receive(self._master_handle)
+        self._c_receive()
 
     def get_domain_data(self, domain) -> Optional[ctypes.POINTER(ctypes.c_uint8)]:
+        base_addr = self._domain_address(domain)
+        if not base_addr:
+            return None
+        return ctypes.cast(base_addr, ctypes.POINTER(ctypes.c_uint8))
+
+    def _domain_address(self, domain) -> Optional[int]:
+        # ecrt_domain_data() as an int; also maps domains from create_domain() on first use.
         if not self._activated:
             logger.warning("Cannot access domain data - master not activated")
             return None
-        return _libec.ecrt_domain_data(domain)
-
-    def read_domain(self, domain, byte_offset: int, size: int) -> Optional[bytes]:
+        base_addr = _libec.ecrt_domain_data(domain)
+        key = id(domain)
+        if base_addr and key not in self._domain_base and any(d is domain for d in self._domains):
+            self._domain_base[key] = base_addr
+            if hasattr(_libec, "ecrt_domain_size"):
+                size = int(_libec.ecrt_domain_size(domain))
+                if size > 0:
+                    array = (ctypes.c_uint8 * size).from_address(base_addr)
+                    self._domain_views[key] = memoryview(array).cast("B")
+        return base_addr
+
+    def read_domain(self, domain, byte_offset: int, size: int) -> Optional[Union[memoryview, bytes]]:
         """
         Read `size` bytes from the process-data domain at `byte_offset`.
 
         This is a convenience wrapper around IgH `ecrt_domain_data()`.
         Callers are expected to call `receive()` + `process_domain()` before reading
         in a cyclic loop.
+
+        Returns a memoryview into the live domain (no copy); it is overwritten by the
+        next `process_domain()` and must not be used after `deactivate()`. Use
+        `read_domain_bytes()` when a snapshot is needed. Falls back to a `bytes` copy
+        when libethercat does not export `ecrt_domain_size()`. Returns None when the
+        range runs past the end of the domain.
         """
-        if domain is None or size <= 0:
-            return None
-        if byte_offset is None or int(byte_offset) < 0:
+        if domain is None or byte_offset is None or size <= 0 or byte_offset < 0:
             return None
 
-        data = self.get_domain_data(domain)
-        if not data:
+        key = id(domain)
+        view = self._domain_views.get(key)
+        if view is None:
+            base_addr = self._domain_base.get(key)
+            if base_addr is None:
+                base_addr = self._domain_address(domain)
+                if not base_addr:
+                    return None
+                view = self._domain_views.get(key)
+            if view is None:
+                return ctypes.string_at(base_addr + int(byte_offset), int(size))
+        end = byte_offset + size
+        if end > len(view):
             return None
+        return view[byte_offset:end]
 
-        base_addr = ctypes.addressof(data.contents)
-        return ctypes.string_at(base_addr + int(byte_offset), int(size))
+    def read_domain_bytes(self, domain, byte_offset: int, size: int) -> Optional[bytes]:
+        """Like `read_domain()`, but always returns an owned `bytes` copy."""
+        raw = self.read_domain(domain, byte_offset, size)
+        return None if raw is None else bytes(raw)
 
     def write_domain(self, domain, byte_offset: int, data_bytes: bytes) -> bool:
         """
@@ -1132,31 +1376,234 @@ class Master:
         Callers are expected to call `queue_domain()` + `send()` after writing
         in a cyclic loop.
         """
-        if domain is None or not data_bytes:
-            return False
-        if byte_offset is None or int(byte_offset) < 0:
+        if domain is None or byte_offset is None or not data_bytes or byte_offset < 0:
             return False
 
-        data = self.get_domain_data(domain)
-        if not data:
+        key = id(domain)
+        view = self._domain_views.get(key)
+        if view is None:
+            base_addr = self._domain_base.get(key)
+            if base_addr is None:
+                base_addr = self._domain_address(domain)
+                if not base_addr:
+                    return False
+                view = self._domain_views.get(key)
+            if view is None:
+                ctypes.memmove(base_addr + int(byte_offset), data_bytes, len(data_bytes))
+                return True
+        end = byte_offset + len(data_bytes)
+        if end > len(view):
             return False
+        view[byte_offset:end] = data_bytes
+        return True
 
-        base_addr = ctypes.addressof(data.contents)
-        ctypes.memmove(base_addr + int(byte_offset), data_bytes, len(data_bytes))
+    def unpack_from_domain(self, domain, byte_offset: int, fmt: str) -> Optional[tuple]:
+        """
+        `struct.unpack_from(fmt)` straight out of the domain at `byte_offset`, without an
+        intermediate `bytes` object. Returns None if the field is out of range.
+        """
+        st = _struct(fmt)
+        view = self._domain_views.get(id(domain))
+        if view is None:
+            raw = self.read_domain(domain, byte_offset, st.size)
+            return st.unpack(raw) if raw and len(raw) == st.size else None
+        if byte_offset < 0 or byte_offset + st.size > len(view):
+            return None
+        return st.unpack_from(view, byte_offset)
+
+    def pack_into_domain(self, domain, byte_offset: int, fmt: str, *values) -> bool:
+        """`struct.pack_into(fmt)` straight into the domain at `byte_offset`."""
+        st = _struct(fmt)
+        view = self._domain_views.get(id(domain))
+        if view is None:
+            return self.write_domain(domain, byte_offset, st.pack(*values))
+        if byte_offset < 0 or byte_offset + st.size > len(view):
+            return False
+        st.pack_into(view, byte_offset, *values)
         return True
 
+    def domain_as_array(self, domain, fmt: str = "B", byte_offset: int = 0,
+                        count: Optional[int] = None) -> Optional[memoryview]:
+        """
+        Typed, zero-copy view of `count` consecutive `fmt` items (a native struct
+        format char, e.g. "H" for uint16) starting at `byte_offset`.
+
+        Shares memory with IgH: reads see the last `process_domain()`, writes go out
+        with the next `queue_domain()`. Must not be used after `deactivate()`.
+        `numpy.frombuffer(view, dtype=...)` wraps it without a copy when NumPy is at hand.
+        """
+        view = self._domain_views.get(id(domain))
+        if view is None:
+            if not self._domain_address(domain):
+                return None
+            view = self._domain_views.get(id(domain))
+            if view is None:
+                return None
+        itemsize = struct.calcsize(fmt)
+        if count is None:
+            count = (len(view) - byte_offset) // itemsize
+        end = byte_offset + count * itemsize
+        if byte_offset < 0 or count < 0 or end > len(view):
+            return None
+        return view[byte_offset:end].cast(fmt)
+
+    def changed_ranges(self, domain, block: int = 64) -> List[Tuple[int, int]]:
+        """
+        `(byte_offset, length)` runs of `domain` that changed since the previous call.
+
+        Keeps a shadow bytearray per domain; the first call reports the whole domain.
+        The live view is never copied as a whole: the all-equal case is a single
+        memcmp of the shadow against the view, otherwise `block`-sized chunks are
+        memcmp'd and only differing chunks are scanned byte by byte and refreshed
+        in the shadow.
+        """
+        key = id(domain)
+        view = self._domain_views.get(key)
+        if view is None:
+            return []
+        n = len(view)
+        shadow = self._domain_shadow.get(key)
+        if shadow is None or len(shadow) != n:
+            self._domain_shadow[key] = bytearray(view)
+            return [(0, n)]
+        if shadow == view:
+            return []
+        runs = []
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            chunk = view[start:stop]
+            if shadow[start:stop] == chunk:
+                continue
+            for i in range(start, stop):
+                if view[i] != shadow[i]:
+                    if runs and runs[-1][0] + runs[-1][1] == i:
+                        runs[-1][1] += 1
+                    else:
+                        runs.append([i, 1])
+            shadow[start:stop] = chunk
+        return [(off, length) for off, length in runs]
+
+    def domain_base_address(self, domain) -> Optional[int]:
+        """
+        Base address of `domain`'s process data, for the `*_unchecked` accessors.
+
+        Valid from `activate()` until `deactivate()`; None if the domain is not mapped.
+        """
+        base_addr = self._domain_base.get(id(domain))
+        if base_addr is None and self._activated:
+            base_addr = self._domain_address(domain) or None
+        return base_addr
+
+    @staticmethod
+    def read_domain_unchecked(base_addr: int, byte_offset: int, size: int) -> bytes:
+        """
+        `read_domain()` without validation, for cyclic loops whose offsets were checked
+        at registration time. `base_addr` comes from `domain_base_address()`.
+        """
+        return ctypes.string_at(base_addr + byte_offset, size)
+
+    @staticmethod
+    def write_domain_unchecked(base_addr: int, byte_offset: int, data_bytes: bytes) -> None:
+        """`write_domain()` without validation; see `read_domain_unchecked()`."""
+        ctypes.memmove(base_addr + byte_offset, data_bytes, len(data_bytes))
+
+    def compile_cycle(self, domain, reads: list, writes: list) -> Callable[[dict, dict], bool]:
+        """
+        Build a `tick(out, values)` function for a fixed domain layout.
+
+        `reads`/`writes` are `(name, byte_offset, fmt)` triples with a single-value
+        struct format each. One tick does receive -> process_domain -> unpack every
+        read into `out[name]` -> pack every `values[name]` that is not None -> queue_domain
+        -> send. Offsets, compiled Structs, the domain view and the bound libethercat
+        calls are resolved here once, so the tick itself does no lookups or validation.
+
+        Must be called after `activate()`; the returned tick is a no-op (returns False)
+        once the master is deactivated.
+        """
+        view = self._domain_views.get(id(domain))
+        if not self._activated or view is None:
+            raise MasterException("compile_cycle() needs an activated, mapped domain")
+        read_plan = []
+        write_plan = []
+        for plan, fields, op in ((read_plan, reads, "unpack_from"), (write_plan, writes, "pack_into")):
+            for name, byte_offset, fmt in fields:
+                st = _struct(fmt)
+                if len(st.unpack(bytes(st.size))) != 1:
+                    raise ValueError(f"Cycle field {name!r}: format {fmt!r} must hold exactly one value")
+                if byte_offset < 0 or byte_offset + st.size > len(view):
+                    raise ValueError(f"Cycle field {name!r}: offset {byte_offset} outside the domain")
+                plan.append((name, getattr(st, op), byte_offset))
+        read_plan = tuple(read_plan)
+        write_plan = tuple(write_plan)
+        receive = self._c_receive
+        send = self._c_send
+        process = functools.partial(self._c_domain_process, domain)
+        queue = functools.partial(self._c_domain_queue, domain)
+
+        def tick(out: dict, values: dict) -> bool:
+            if not self._activated:
+                return False
+            receive()
+            process()
+            for name, unpack_from, byte_offset in read_plan:
+                out[name] = unpack_from(view, byte_offset)[0]
+            for name, pack_into, byte_offset in write_plan:
+                value = values.get(name)
+                if value is not None:
+                    pack_into(view, byte_offset, value)
+            queue()
+            send()
+            return True
+
+        return tick
+
+    def publish_snapshot(self, domain, byte_offset: int, size: int, slots: int = 64) -> bool:
+        """
+        Copy `size` domain bytes at `byte_offset` into the snapshot ring (cyclic side).
+
+        The ring is created on first use with `size` as its stride; later calls must
+        use the same size. Returns False if the domain is not mapped, the window is
+        out of range, or the consumer has fallen a full ring behind.
+        """
+        ring = self._snapshot_ring
+        if ring is None:
+            ring = self._snapshot_ring = SnapshotRing(size, slots)
+        elif size != ring.stride:
+            raise ValueError(f"Snapshot size {size} does not match ring stride {ring.stride}")
+        key = id(domain)
+        base_addr = self._domain_base.get(key)
+        if base_addr is None:
+            base_addr = self._domain_address(domain)
+            if not base_addr:
+                return False
+        view = self._domain_views.get(key)
+        if byte_offset < 0 or (view is not None and byte_offset + size > len(view)):
+            return False
+        return ring.push_from(base_addr + byte_offset)
+
+    def pop_snapshot(self) -> Optional[bytes]:
+        """Oldest unread snapshot published by `publish_snapshot()` (consumer side), or None."""
+        ring = self._snapshot_ring
+        return ring.pop() if ring is not None else None
+
     def process_domain(self, domain):
-        if domain and self._activated:
-            _libec.ecrt_domain_process(domain)
+        if domain:
+            self._c_domain_process(domain)
 
     def queue_domain(self, domain):
-        if domain and self._activated:
-            _libec.ecrt_domain_queue(domain)
+        if domain:
+            self._c_domain_queue(domain)
 
     def domain_state(self, domain) -> Tuple[int, int]:
-        state = ec_domain_state_t()
-        if domain and self._activated:
+        if not (domain and self._activated):
+            return (0, 0)
+        buf = self._domain_state_bufs.get(id(domain))
+        if buf is None:
+            state = ec_domain_state_t()
             _libec.ecrt_domain_state(domain, ctypes.byref(state))
+        else:
+            state, state_ptr = buf
+            _libec.ecrt_domain_state(domain, state_ptr)
         return (state.working_counter, state.wc_state)
 
 """
@@ -4,14 +4,19 @@ import logging
 import multiprocessing as mp
 import os
 import queue
+import select
 import signal
+import struct
 import sys
+import threading
 import time
 import traceback
 from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 _repo_root = Path(__file__).resolve().parent.parent
 _github_root = _repo_root.parent
@@ -28,6 +33,7 @@ except ImportError:
     from RPI.lib.trajectory_core import RuckigVelocityIntegrator, ContinuousRotationTrajectory, RUCKIG_AVAILABLE as RUCKIG_AVAILABLE_CORE
 
 from .commands import Command, CommandType
+from .command_ring import CommandRing, collect_in_order, ring_eligible
 from .status_model import NetworkStatus
 from .constants import (
     CW_INDEX, SW_INDEX,
@@ -38,7 +44,10 @@ from .constants import (
     ERROR_CODE_INDEX,
     MODE_PP, MODE_PV, MODE_PT, MODE_CSP, MODE_HM,
     CW_BIT_NEW_SET_POINT, CW_BIT_CHANGE_IMMEDIATELY, CW_BIT_ABS_REL, CW_BIT_HALT, CW_ENABLE_OP_SIMPLIFIED,
-    PROBE_FUNC_ENABLE_PROBE1, PROBE_FUNC_PROBE1_POS_EDGE, PROBE_FUNC_PROBE1_NEG_EDGE,
+    SW_MASK_FAULT, SW_MASK_WARNING, SW_MASK_TARGET_REACHED, SW_MASK_INTERNAL_LIMIT_ACTIVE, SW_MASK_SETPOINT_ACK,
+    PROBE_FUNC_ENABLE_PROBE1, PROBE_FUNC_PROBE1_POS_EDGE, PROBE_FUNC_PROBE1_NEG_EDGE, PROBE1_DISABLE,
+    INDEX_NAME, MODE_NAME, PDO_ENTRY_STRUCTS, PDO_CLASS, HOT_RT_INDICES,
+    CiA402State, SW_STATE_LUT, SW_STATE_MASK, CW_NEXT, CW_FAULT_RESET,
 )
 from .config_schema import EthercatNetworkConfig, DriveConfig
 from .igh_master import (
@@ -86,6 +95,48 @@ FAULT_CODE_LABELS: Dict[int, str] = {
 }
 
 
+# Per-drive slots decoded into NetworkStatus.drives for CiA 402 drives (in_op/enabled
+# are decoded for every slave).
+_CIA402_STATUS_SLOTS = tuple(
+    (key, slot) for key, slot in SHM.DRIVE_FIELD_SLOTS.items() if key not in SHM.DRIVE_COMMON_FIELDS
+)
+_STATUSWORD_FLAG_ITEMS = tuple(SHM.DRIVE_STATUSWORD_FLAGS.items())
+# Actual-value PDO entries mirrored into each drive record: (entry key, wire format, drive slot).
+_ACTUALS_PDO_SLOTS = tuple(
+    (key, PDO_ENTRY_STRUCTS[key], slot)
+    for key, slot in (
+        ((POSITION_ACTUAL_INDEX, 0), SHM.DRIVE_POSITION),
+        ((VELOCITY_ACTUAL_INDEX, 0), SHM.DRIVE_VELOCITY),
+        ((TORQUE_ACTUAL_INDEX, 0), SHM.DRIVE_TORQUE),
+        ((MODES_OP_DISPLAY_INDEX, 0), SHM.DRIVE_MODE),
+        ((ERROR_CODE_INDEX, 0), SHM.DRIVE_ERROR_CODE),
+        ((DIGITAL_INPUTS_INDEX, 0), SHM.DRIVE_DIGITAL_INPUTS),
+        ((DIP_IN_STATE_INDEX, 1), SHM.DRIVE_DIP_IN_STATE),
+    )
+)
+# Largest run of unused bytes folded into one fused actual-value read.
+_ACTUALS_SPAN_MAX_GAP = 8
+# Drive slots cleared every cycle when their entry is not mapped.
+_ACTUALS_ZERO_IF_UNMAPPED = (
+    ((POSITION_ACTUAL_INDEX, 0), SHM.DRIVE_POSITION),
+    ((VELOCITY_ACTUAL_INDEX, 0), SHM.DRIVE_VELOCITY),
+)
+
+
+# Little-endian encodings of the 16-bit words written every cycle (controlword, probe
+# function). Only a handful of distinct words occur, so each is encoded once and the
+# same bytes object is reused instead of allocating a new one per write.
+_U16_LE: Dict[int, bytes] = {cw: cw.to_bytes(2, 'little') for cw in set(CW_NEXT) | {0}}
+
+
+def _u16_le(value: int) -> bytes:
+    value &= 0xFFFF
+    raw = _U16_LE.get(value)
+    if raw is None:
+        raw = _U16_LE[value] = value.to_bytes(2, 'little')
+    return raw
+
+
 def _wrap_i32(v: int) -> int:
     return ((v + 0x8000_0000) % 0x1_0000_0000) - 0x8000_0000
 
@@ -354,6 +405,116 @@ class _SdoRequestManager:
             slot.desired_write = None
             slot.desired_write_hash = None
 
+# Bytes of pickled commands the manager may hold back while the command pipe is full;
+# send_command refuses beyond this instead of blocking.
+_CMD_OUTBOX_MAX = 1 << 20
+
+# Commands rejected when cfg.forbid_motion_commands is set.
+_MOTION_COMMANDS = frozenset((
+    CommandType.SET_VELOCITY_MODE,
+    CommandType.SET_POSITION_MODE,
+    CommandType.SET_CSP_MODE,
+    CommandType.SET_TORQUE_MODE,
+    CommandType.SET_VELOCITY,
+    CommandType.SET_POSITION,
+    CommandType.SET_POSITION_CSP,
+    CommandType.START_HOMING,
+    CommandType.SET_TORQUE,
+    CommandType.START_RUCKIG_POSITION,
+    CommandType.START_RUCKIG_VELOCITY,
+    CommandType.START_SEMI_ROTARY_RT,
+    CommandType.UPDATE_SEMI_ROTARY_RT,
+    CommandType.ENABLE_DRIVE,
+))
+# Commands that supersede a shared-memory CSP target written before them (see
+# SHM.TARGET_CMD_SEQ); the target path has no place in the command stream otherwise.
+_CSP_TARGET_SUPERSEDING = _MOTION_COMMANDS | frozenset((
+    CommandType.STOP_MOTION,
+    CommandType.STOP_RUCKIG,
+    CommandType.STOP_SEMI_ROTARY_RT,
+    CommandType.STOP_DIE_VELOCITY_TEST,
+    CommandType.DISABLE_DRIVE,
+))
+
+# (index, subindex, size) of the runtime SDO request objects created per CiA 402 slave.
+_RUNTIME_SDO_REQUEST_SPECS = (
+    (ERROR_CODE_INDEX, 0, 2),          # 0x603F Error code
+    (MODES_OP_INDEX, 0, 1),            # 0x6060 Modes of operation
+    (TARGET_VELOCITY_INDEX, 0, 4),     # 0x60FF Target velocity
+    (TARGET_TORQUE_INDEX, 0, 2),       # 0x6071 Target torque
+    (TARGET_POSITION_INDEX, 0, 4),     # 0x607A Target position
+    (PROBE_FUNCTION_INDEX, 0, 2),      # 0x60B8 Touch probe function
+)
+
+# CommandType -> EtherCATProcess handler method name; bound per instance in __init__.
+_COMMAND_HANDLER_NAMES: Dict[CommandType, str] = {
+    CommandType.SET_VELOCITY_MODE: "_cmd_set_velocity_mode",
+    CommandType.SET_POSITION_MODE: "_cmd_set_position_mode",
+    CommandType.SET_CSP_MODE: "_cmd_set_csp_mode",
+    CommandType.SET_TORQUE_MODE: "_cmd_set_torque_mode",
+    CommandType.SET_VELOCITY: "_cmd_set_velocity",
+    CommandType.SET_POSITION: "_cmd_set_position",
+    CommandType.SET_POSITION_CSP: "_cmd_set_position_csp",
+    CommandType.START_HOMING: "_cmd_start_homing",
+    CommandType.ARM_PROBE: "_cmd_arm_probe",
+    CommandType.SET_TORQUE: "_cmd_set_torque",
+    CommandType.STOP_MOTION: "_cmd_stop_motion",
+    CommandType.START_RUCKIG_POSITION: "_cmd_start_ruckig_position",
+    CommandType.START_RUCKIG_VELOCITY: "_cmd_start_ruckig_velocity",
+    CommandType.STOP_RUCKIG: "_cmd_stop_ruckig",
+    CommandType.START_SEMI_ROTARY_RT: "_cmd_start_semi_rotary_rt",
+    CommandType.UPDATE_SEMI_ROTARY_RT: "_cmd_update_semi_rotary_rt",
+    CommandType.STOP_SEMI_ROTARY_RT: "_cmd_stop_semi_rotary_rt",
+    CommandType.START_DIE_VELOCITY_TEST: "_cmd_start_die_velocity_test",
+    CommandType.STOP_DIE_VELOCITY_TEST: "_cmd_stop_die_velocity_test",
+    CommandType.DISABLE_PROBE: "_cmd_disable_probe",
+    CommandType.ENABLE_DRIVE: "_cmd_enable_drive",
+    CommandType.DISABLE_DRIVE: "_cmd_disable_drive",
+    CommandType.WRITE_RAW_PDO: "_cmd_write_raw_pdo",
+    CommandType.WRITE_SDO: "_cmd_write_sdo",
+}
+
+
+class _CommandPipeReader:
+    """
+    Non-blocking consumer for the manager's command pipe (Connection framing:
+    4-byte big-endian length + pickle).
+
+    The manager writes the pipe non-blocking, so a frame larger than PIPE_BUF can
+    arrive in pieces with the rest still in its outbox. Connection.recv() would
+    block on such a frame; poll() here reports one only once it is complete, so
+    recv() never waits on the writer.
+    """
+
+    def __init__(self, conn: Connection):
+        self._conn = conn
+        self._fd = conn.fileno()
+        os.set_blocking(self._fd, False)
+        self._buf = bytearray()
+
+    def _frame_ready(self) -> bool:
+        buf = self._buf
+        return len(buf) >= 4 and len(buf) >= 4 + struct.unpack_from("!i", buf)[0]
+
+    def poll(self) -> bool:
+        while not self._frame_ready():
+            try:
+                chunk = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return False
+            if not chunk:
+                return False
+            self._buf += chunk
+        return True
+
+    def recv(self) -> Any:
+        buf = self._buf
+        end = 4 + struct.unpack_from("!i", buf)[0]
+        obj = ForkingPickler.loads(buf[4:end])
+        del buf[:end]
+        return obj
+
+
 class EtherCATProcess:
     def _sdo_queue_allowed_now(self) -> bool:
         """
@@ -394,21 +555,14 @@ class EtherCATProcess:
             return True
         if not bool(getattr(self.cfg, "enable_runtime_sdo_requests", True)):
             return True
-        req_specs = [
-            (ERROR_CODE_INDEX, 0, 2),          # 0x603F Error code
-            (MODES_OP_INDEX, 0, 1),            # 0x6060 Modes of operation
-            (TARGET_VELOCITY_INDEX, 0, 4),     # 0x60FF Target velocity
-            (TARGET_TORQUE_INDEX, 0, 2),       # 0x6071 Target torque
-            (TARGET_POSITION_INDEX, 0, 4),     # 0x607A Target position
-            (PROBE_FUNCTION_INDEX, 0, 2),      # 0x60B8 Touch probe function
-        ]
-        for idx, sub, size in req_specs:
+        for idx, sub, size in _RUNTIME_SDO_REQUEST_SPECS:
             try:
                 req = sc.create_sdo_request(int(idx), int(sub), int(size))
                 self._sdo_mgr.register(int(slave_pos), int(idx), int(sub), req=req, max_size=int(size))
             except Exception as e:
                 self._emit_process_log(
-                    f"[EC] Failed to create SDO request object slave={slave_pos} 0x{int(idx):04X}:{int(sub)} size={int(size)}: {e}",
+                    f"[EC] Failed to create SDO request object slave={slave_pos} 0x{int(idx):04X}:{int(sub)} "
+                    f"({INDEX_NAME.get(int(idx), '?')}) size={int(size)}: {e}",
                     stderr=True,
                 )
                 return False
@@ -555,7 +709,7 @@ class EtherCATProcess:
                 name = signal.Signals(signum).name
             except Exception:
                 name = str(signum)
-            logger.info(f"Received {name} - stopping EtherCAT process gracefully...")
+            logger.info("Received %s - stopping EtherCAT process gracefully...", name)
             self.stop_event.set()
 
         for sig in (signal.SIGTERM, signal.SIGINT):
@@ -567,17 +721,30 @@ class EtherCATProcess:
 
     """
     Isolated process that owns the EtherCAT master and cyclic loop.
-    Communication via command/status queues. Non-blocking, resilient runtime.
+    Communication via a command pipe, a set-point ring and shared-memory status.
+    Non-blocking, resilient runtime.
     """
 
-    def __init__(self, cfg: EthercatNetworkConfig, cmd_q: mp.Queue, status_q: mp.Queue, stop_event: mp.Event,
-                 actuals_shm=None, targets_shm=None):
+    def __init__(self, cfg: EthercatNetworkConfig, cmd_conn: Connection, status_q: mp.Queue, stop_event: mp.Event,
+                 actuals_shm=None, targets_shm=None, cmd_ring: Optional[CommandRing] = None):
         self.cfg = cfg
-        self.cmd_q = cmd_q
+        self.cmd_conn = cmd_conn
+        # Built in the child (run); see _CommandPipeReader.
+        self._cmd_reader: Optional[_CommandPipeReader] = None
+        self.cmd_ring = cmd_ring
         self.status_q = status_q
         self.stop_event = stop_event
-        self._actuals_shm = actuals_shm
-        self._targets_shm = targets_shm
+        # Raw blocks from SHM.alloc(); the aligned views are built in the child (run).
+        self._actuals_raw = actuals_shm
+        self._targets_raw = targets_shm
+        self._actuals_shm = None
+        self._targets_shm = None
+        self._shm_seqlock: int = 0
+        # target_id -> sequence number of the newest dispatched _CSP_TARGET_SUPERSEDING command
+        self._last_motion_seq: Dict[int, int] = {}
+        self._command_handlers: Dict[CommandType, Callable[[Command], None]] = {
+            ct: getattr(self, name) for ct, name in _COMMAND_HANDLER_NAMES.items()
+        }
         self.master = Master(master_index=cfg.master_index)
         self.domain = None
         self.slave_handles: Dict[int, Any] = {}
@@ -639,6 +806,11 @@ class EtherCATProcess:
         self._m2s_k: float = float(getattr(cfg, "dc_m2s_k", 0.01) or 0.01)
         self._m2s_max_correction_ns: int = int(getattr(cfg, "dc_m2s_max_correction_ns", 20_000) or 20_000)
         self._m2s_logged_pll: bool = False
+        # Derived config values used every cycle; cfg does not change once the process starts.
+        self._cycle_budget_ns: int = int(self.cfg.cycle_time_ms * 1_000_000)
+        self._cycle_dt_s: float = float(self.cfg.cycle_time_ms) / 1000.0
+        self._pp_ack_mask: int = int(self.cfg.pp_ack_mask)
+        self._pp_ack_timeout_ns: int = int(max(self.cfg.pp_ack_timeout_ms, 1.0) * 1_000_000)
         self._jitter_warmup_cycles: int = max(0, int(getattr(self.cfg, "jitter_warmup_cycles", 0)))
         self._deadline_miss_threshold_ns: int = int(getattr(self.cfg, "deadline_miss_threshold_ns", 0) or 0)
         if self._deadline_miss_threshold_ns <= 0:
@@ -675,6 +847,7 @@ class EtherCATProcess:
         self._log_q = None
         self._log_thread = None
         self._pdo_cache: Dict[int, Dict[str, int]] = {}
+        self._actuals_plan: Optional[List[Tuple[int, int, tuple, tuple]]] = None
         self._phase_recv: int = 0
         self._phase_state: int = 0
         self._phase_cia: int = 0
@@ -837,6 +1010,8 @@ class EtherCATProcess:
         shm = self._actuals_shm
         if shm is None:
             return
+        self._shm_seqlock += 1
+        shm[SHM.SLOT_SEQLOCK] = self._shm_seqlock
         shm[SHM.SLOT_CYCLE_COUNT] = int(self.cycle_count)
         shm[SHM.SLOT_TIMESTAMP_NS] = time.time_ns()
         shm[SHM.SLOT_JITTER_NS] = int(self._last_cycle_jitter_ns or 0)
@@ -882,40 +1057,99 @@ class EtherCATProcess:
                         shm[SHM.SLOT_IO_DO_BASE + do_idx] = raw[0]
                         do_idx += 1
         cache = self._pdo_cache
-        for slave_pos, entries in self.offsets.items():
-            if slave_pos >= SHM.MAX_DRIVES:
-                continue
-            base = SHM.DRIVE_BASE + slave_pos * SHM.DRIVE_STRIDE
+        plan = self._actuals_plan
+        if plan is None:
+            plan = self._actuals_plan = self._build_actuals_plan()
+        read_domain = self.master.read_domain
+        domain = self.domain
+        for slave_pos, base, spans, zero_slots in plan:
             c = cache.get(slave_pos)
             shm[base + SHM.DRIVE_STATUSWORD] = c.get('sw', 0) if c else 0
-            if (POSITION_ACTUAL_INDEX, 0) in entries:
-                raw_p = self.master.read_domain(self.domain, entries[(POSITION_ACTUAL_INDEX, 0)], 4) or b"\x00\x00\x00\x00"
-                shm[base + SHM.DRIVE_POSITION] = int.from_bytes(raw_p, 'little', signed=True)
-            else:
-                shm[base + SHM.DRIVE_POSITION] = 0
-            if (VELOCITY_ACTUAL_INDEX, 0) in entries:
-                raw_v = self.master.read_domain(self.domain, entries[(VELOCITY_ACTUAL_INDEX, 0)], 4) or b"\x00\x00\x00\x00"
-                shm[base + SHM.DRIVE_VELOCITY] = int.from_bytes(raw_v, 'little', signed=True)
-            else:
-                shm[base + SHM.DRIVE_VELOCITY] = 0
-            if (TORQUE_ACTUAL_INDEX, 0) in entries:
-                raw = self.master.read_domain(self.domain, entries[(TORQUE_ACTUAL_INDEX, 0)], 2) or b"\x00\x00"
-                shm[base + SHM.DRIVE_TORQUE] = int.from_bytes(raw, 'little', signed=True)
-            if (MODES_OP_DISPLAY_INDEX, 0) in entries:
-                raw = self.master.read_domain(self.domain, entries[(MODES_OP_DISPLAY_INDEX, 0)], 1) or b"\x00"
-                shm[base + SHM.DRIVE_MODE] = raw[0]
-            if (ERROR_CODE_INDEX, 0) in entries:
-                raw = self.master.read_domain(self.domain, entries[(ERROR_CODE_INDEX, 0)], 2) or b"\x00\x00"
-                shm[base + SHM.DRIVE_ERROR_CODE] = int.from_bytes(raw, 'little')
-            if (DIGITAL_INPUTS_INDEX, 0) in entries:
-                raw = self.master.read_domain(self.domain, entries[(DIGITAL_INPUTS_INDEX, 0)], 4) or b"\x00\x00\x00\x00"
-                shm[base + SHM.DRIVE_DIGITAL_INPUTS] = int.from_bytes(raw, 'little')
-            if (DIP_IN_STATE_INDEX, 1) in entries:
-                raw = self.master.read_domain(self.domain, entries[(DIP_IN_STATE_INDEX, 1)], 4) or b"\x00\x00\x00\x00"
-                shm[base + SHM.DRIVE_DIP_IN_STATE] = int.from_bytes(raw, 'little')
+            for offset, fmt, slots in spans:
+                raw = read_domain(domain, offset, fmt.size)
+                if raw:
+                    for slot, value in zip(slots, fmt.unpack(raw)):
+                        shm[slot] = value
+                else:
+                    for slot in slots:
+                        shm[slot] = 0
+            for slot in zero_slots:
+                shm[slot] = 0
             shm[base + SHM.DRIVE_IN_OP] = 1 if self.slave_in_op.get(slave_pos, False) else 0
             shm[base + SHM.DRIVE_ENABLED] = 1 if (self.drive_enabled.get(slave_pos, False) and not self._manual_disable.get(slave_pos, False)) else 0
         shm[SHM.SLOT_SEQUENCE] = int(self.cycle_count)
+        self._shm_seqlock += 1
+        shm[SHM.SLOT_SEQLOCK] = self._shm_seqlock
+
+    @staticmethod
+    def _log_non_cyclic_pdo_entries(slave_pos: int, flat_entries: List[Tuple[int, int, int]]) -> None:
+        """Report mapped objects that PDO_CLASS marks as not needed every cycle (SDO candidates)."""
+        names = sorted({
+            INDEX_NAME.get(idx, hex(idx))
+            for idx, _sub, _bits in flat_entries
+            if idx in PDO_CLASS and idx not in HOT_RT_INDICES
+        })
+        if names:
+            logger.info(
+                "Slave %s: PDO maps non-cyclic objects %s (candidates for SDO access to shrink the frame)",
+                slave_pos, ", ".join(names),
+            )
+
+    def _build_actuals_plan(self) -> List[Tuple[int, int, tuple, tuple]]:
+        """
+        Resolve, once per PDO registration, which domain offsets feed each drive record.
+
+        Entries are (position, drive_base, spans, zero_slots); each span is
+        (domain_offset, struct, shm_slots) and decodes several mapped actual-value
+        entries with one domain read and one unpack.
+        """
+        plan = []
+        for slave_pos, entries in self.offsets.items():
+            if slave_pos >= SHM.MAX_DRIVES:
+                continue
+            base = SHM.DRIVE_BASE + slave_pos * SHM.DRIVE_STRIDE
+            reads = [
+                (entries[key], fmt, base + slot) for key, fmt, slot in _ACTUALS_PDO_SLOTS if key in entries
+            ]
+            zero_slots = tuple(base + slot for key, slot in _ACTUALS_ZERO_IF_UNMAPPED if key not in entries)
+            plan.append((slave_pos, base, self._fuse_pdo_reads(reads), zero_slots))
+        return plan
+
+    @staticmethod
+    def _fuse_pdo_reads(reads: List[Tuple[int, struct.Struct, int]]) -> Tuple[Tuple[int, struct.Struct, Tuple[int, ...]], ...]:
+        """
+        Specialize per-entry (offset, struct, slot) reads into as few spans as the layout allows.
+
+        Entries are merged in offset order while they do not overlap and are at most
+        _ACTUALS_SPAN_MAX_GAP bytes apart; the gaps become pad bytes in the span format.
+        """
+        spans = []
+        start = end = None
+        fmt = ""
+        slots: List[int] = []
+        for offset, entry_fmt, slot in sorted(reads, key=lambda r: r[0]):
+            code = entry_fmt.format.lstrip("<")
+            if start is not None and end <= offset <= end + _ACTUALS_SPAN_MAX_GAP:
+                if offset > end:
+                    fmt += f"{offset - end}x"
+                fmt += code
+                slots.append(slot)
+                end = offset + entry_fmt.size
+                continue
+            if start is not None:
+                spans.append((start, struct.Struct("<" + fmt), tuple(slots)))
+            start, end, fmt, slots = offset, offset + entry_fmt.size, code, [slot]
+        if start is not None:
+            spans.append((start, struct.Struct("<" + fmt), tuple(slots)))
+        return tuple(spans)
+
+    def _drain_commands(self) -> None:
+        """Dispatch this cycle's commands from the pipe (up to 16) and the ring, in send order."""
+        last_motion_seq = self._last_motion_seq
+        for seq, cmd in collect_in_order(self._cmd_reader, self.cmd_ring):
+            if cmd.type in _CSP_TARGET_SUPERSEDING:
+                last_motion_seq[cmd.target_id] = seq
+            self._handle_command(cmd)
 
     def _read_targets_from_shm(self) -> None:
         shm = self._targets_shm
@@ -924,9 +1158,27 @@ class EtherCATProcess:
         for pos in range(SHM.MAX_DRIVES):
             base = SHM.TARGET_BASE + pos * SHM.TARGET_STRIDE
             if shm[base + SHM.TARGET_VALID] == 1:
-                self._csp_target_next[pos] = int(shm[base + SHM.TARGET_CSP])
-                self.last_mode_cmd[pos] = int(shm[base + SHM.TARGET_MODE])
+                # Clear first: a target published while we read is picked up next cycle
+                # instead of having its VALID flag overwritten.
                 shm[base + SHM.TARGET_VALID] = 0
+                # This path bypasses _handle_command, so apply its gates here: drop
+                # targets for a manually disabled drive (re-enable must seed from the
+                # actual position) and while motion commands are forbidden.
+                if self._manual_disable.get(pos, False) or getattr(self.cfg, "forbid_motion_commands", False):
+                    continue
+                # Read after this cycle's commands, so drop it if one of them (or an
+                # earlier cycle's) was sent after the target was written.
+                if self._last_motion_seq.get(pos, -1) >= shm[base + SHM.TARGET_CMD_SEQ]:
+                    continue
+                self._csp_target_next[pos] = int(shm[base + SHM.TARGET_CSP])
+                mode = int(shm[base + SHM.TARGET_MODE])
+                if mode:
+                    self.last_mode_cmd[pos] = mode
+                else:
+                    # Same as SET_POSITION_CSP: manual streaming overrides the trajectory generator.
+                    self._ruckig_requests.pop(pos, None)
+                    if self._ruckig_planner:
+                        self._ruckig_planner.stop(pos)
 
     @staticmethod
     def _percentile_value(values: List[int], percentile: float) -> Optional[int]:
@@ -1037,11 +1289,12 @@ class EtherCATProcess:
             self.master.slave_config_watchdog(s, divider_i, intervals)
             approx_ms = (intervals * base_ns) / 1_000_000.0
             logger.info(
-                f"Slave {dcfg.position}: SM watchdog configured "
-                f"(divider={divider_i}, intervals={intervals}, approx={approx_ms:.1f}ms)"
+                "Slave %s: SM watchdog configured "
+                "(divider=%s, intervals=%s, approx=%.1fms)",
+                dcfg.position, divider_i, intervals, approx_ms
             )
         except Exception as e:
-            logger.warning(f"Slave {dcfg.position}: SM watchdog config failed: {e}")
+            logger.warning("Slave %s: SM watchdog config failed: %s", dcfg.position, e)
 
     def _setup(self) -> bool:
         # Open/request the master with or without PDO based on config
@@ -1063,7 +1316,7 @@ class EtherCATProcess:
 
         for dcfg in self.cfg.slaves:
             if dcfg.vendor_id is None or dcfg.product_code is None:
-                logger.error(f"Slave {dcfg.position} missing vendor_id/product_code")
+                logger.error("Slave %s missing vendor_id/product_code", dcfg.position)
                 return False
 
             s = self.master.config_slave(dcfg.alias, dcfg.position, dcfg.vendor_id, dcfg.product_code)
@@ -1080,8 +1333,7 @@ class EtherCATProcess:
 
             self._configure_sync_manager_watchdog(dcfg, s)
 
-            for (idx, sub, data) in getattr(dcfg, 'startup_sdos', []):
-                self.master.slave_config_sdo(s, idx, sub, data)
+            self.master.slave_config_sdo_batch(s, getattr(dcfg, 'startup_sdos', []))
 
             if dcfg.xml:
                 decoded = decode_esi(
@@ -1103,6 +1355,7 @@ class EtherCATProcess:
 
                 flat_rx = [e for entries in rx_pdo_map.values() for e in entries]
                 flat_tx = [e for entries in tx_pdo_map.values() for e in entries]
+                self._log_non_cyclic_pdo_entries(dcfg.position, flat_rx + flat_tx)
                 supports = dict(decoded.supports or {})
                 supports.update(
                     {
@@ -1158,7 +1411,7 @@ class EtherCATProcess:
                     "mode_display": any(e[0] == MODES_OP_DISPLAY_INDEX for e in flat_tx),
                 }
             else:
-                logger.error(f"Slave {dcfg.position}: requires either xml or sync_configs")
+                logger.error("Slave %s: requires either xml or sync_configs", dcfg.position)
                 return False
 
             if getattr(dcfg, "features_overrides", None):
@@ -1171,6 +1424,7 @@ class EtherCATProcess:
                     self.domain, dcfg.alias, dcfg.position, dcfg.vendor_id, dcfg.product_code, register_list
                 )
                 self.offsets[dcfg.position] = offsets
+                self._actuals_plan = None
                 self.pdo_maps[dcfg.position] = {
                     'rx': rx_pdo_map,
                     'tx': tx_pdo_map,
@@ -1205,7 +1459,7 @@ class EtherCATProcess:
                     sync1_cycle_time_ns=sync1_cycle,
                     sync1_shift_ns=sync1_shift
                 )
-                logger.info(f"DC configured for slave {dcfg.position}")
+                logger.info("DC configured for slave %s", dcfg.position)
 
         if any(bool(getattr(d, "ruckig", None) and getattr(d.ruckig, "enabled", False)) for d in self.cfg.slaves):
             self._ruckig_planner = RuckigCspPlanner()
@@ -1235,17 +1489,17 @@ class EtherCATProcess:
                 s = self.slave_handles.get(dc_ref_pos)
                 if s:
                     self.master.select_reference_clock(s)
-                    logger.info(f"[DC] Selected slave {dc_ref_pos} as DC reference clock (explicit)")
+                    logger.info("[DC] Selected slave %s as DC reference clock (explicit)", dc_ref_pos)
                     selected_dc_ref = dc_ref_pos
                 else:
-                    logger.error(f"dc_reference_slave={dc_ref_pos} not found in slave_handles")
+                    logger.error("dc_reference_slave=%s not found in slave_handles", dc_ref_pos)
             else:
                 for dcfg in self.cfg.slaves:
                     if dcfg.enable_dc:
                         s = self.slave_handles.get(dcfg.position)
                         if s:
                             self.master.select_reference_clock(s)
-                            logger.info(f"[DC] Selected slave {dcfg.position} as DC reference clock (auto, first DC-enabled)")
+                            logger.info("[DC] Selected slave %s as DC reference clock (auto, first DC-enabled)", dcfg.position)
                             selected_dc_ref = dcfg.position
                             break
 
@@ -1280,7 +1534,7 @@ class EtherCATProcess:
                     s = self.slave_handles.get(dcfg.position)
                     if s:
                         self.master.slave_config_sdo(s, MODES_OP_INDEX, 0, bytes([mode]))
-                        logger.info(f"Slave {dcfg.position}: mode 0x{mode:02X} registered as startup SDO")
+                        logger.info("Slave %s: mode 0x%02X (%s) registered as startup SDO", dcfg.position, mode, MODE_NAME.get(mode, "?"))
                     self._last_mode_sdo[dcfg.position] = mode
 
             for dcfg in self.cfg.slaves:
@@ -1293,9 +1547,9 @@ class EtherCATProcess:
                 if s:
                     try:
                         self.master.slave_config_sdo(s, MAX_TORQUE_INDEX, 0, (1000).to_bytes(2, 'little', signed=True))
-                        logger.info(f"Slave {dcfg.position}: 0x6072 (max torque) set to 1000 (100%% per-mille)")
+                        logger.info("Slave %s: 0x6072 (max torque) set to 1000 (100%% per-mille)", dcfg.position)
                     except Exception as e:
-                        logger.warning(f"Slave {dcfg.position}: could not set 0x6072: {e}")
+                        logger.warning("Slave %s: could not set 0x6072: %s", dcfg.position, e)
 
             self.master.activate()
             logger.info("Master activated")
@@ -1354,7 +1608,7 @@ class EtherCATProcess:
             return
         cycle_ns = int(self.cfg.cycle_time_ms * 1_000_000)
         shutdown_cycles = max(int(500_000_000 / cycle_ns), 50)
-        logger.info(f"Graceful shutdown: disabling all drives over {shutdown_cycles} cycles...")
+        logger.info("Graceful shutdown: disabling all drives over %s cycles...", shutdown_cycles)
         for pos in self._cia402_positions:
             entries = self.offsets.get(pos, {})
             if (TARGET_VELOCITY_INDEX, 0) in entries:
@@ -1392,441 +1646,455 @@ class EtherCATProcess:
 
     def _handle_command(self, cmd: Command):
         if getattr(self.cfg, "forbid_motion_commands", False):
-            blocked = {
-                CommandType.SET_VELOCITY_MODE,
-                CommandType.SET_POSITION_MODE,
-                CommandType.SET_CSP_MODE,
-                CommandType.SET_TORQUE_MODE,
-                CommandType.SET_VELOCITY,
-                CommandType.SET_POSITION,
-                CommandType.SET_POSITION_CSP,
-                CommandType.START_HOMING,
-                CommandType.SET_TORQUE,
-                CommandType.START_RUCKIG_POSITION,
-                CommandType.START_RUCKIG_VELOCITY,
-                CommandType.START_SEMI_ROTARY_RT,
-                CommandType.UPDATE_SEMI_ROTARY_RT,
-                CommandType.ENABLE_DRIVE,
-            }
-            if cmd.type in blocked:
+            if cmd.type in _MOTION_COMMANDS:
                 self._motion_command_block_count += 1
-                logger.warning(f"Blocked command in no-motion mode: {cmd.type.name} target={cmd.target_id}")
+                logger.warning("Blocked command in no-motion mode: %s target=%s", cmd.type.name, cmd.target_id)
                 return
-        # Store intent; cyclic writer will realize it via PDO or SDO
-        if cmd.type == CommandType.SET_VELOCITY_MODE:
-            self.last_mode_cmd[cmd.target_id] = MODE_PV
-        elif cmd.type == CommandType.SET_POSITION_MODE:
-            self.last_mode_cmd[cmd.target_id] = MODE_PP
-        elif cmd.type == CommandType.SET_CSP_MODE:
-            self.last_mode_cmd[cmd.target_id] = MODE_CSP
-        elif cmd.type == CommandType.SET_TORQUE_MODE:
-            self.last_velocity_cmd[cmd.target_id] = 0.0
-            self.last_mode_cmd[cmd.target_id] = MODE_PT
-        elif cmd.type == CommandType.SET_VELOCITY:
-            raw = float(cmd.value or 0.0)
-            dcfg = next((d for d in self.cfg.slaves if d.position == cmd.target_id), None)
-            cap = getattr(dcfg, 'max_velocity', None)
-            if cap is None:
-                cap = 500000.0
-            if abs(raw) > cap:
-                raw = cap if raw > 0 else -cap
-            self.last_velocity_cmd[cmd.target_id] = raw
-            # If this drive requires a set-point pulse to latch PV targets, schedule it.
-            dcfg = next((d for d in self.cfg.slaves if d.position == cmd.target_id), None)
-            if dcfg and getattr(dcfg, 'pv_requires_setpoint_toggle', False):
-                # If a pulse is already active, force a one-cycle clear to guarantee a fresh edge.
-                if self._pv_pulse_active.get(cmd.target_id, False):
-                    self._pv_force_clear_cycles[cmd.target_id] = 1
-                self._pv_pulse_pending[cmd.target_id] = True
-        elif cmd.type in (CommandType.SET_POSITION, CommandType.SET_POSITION_CSP):
-            if cmd.type == CommandType.SET_POSITION_CSP:
-                # CSP: do NOT mix with PP latching semantics; maintain a streaming target (atomic swap per cycle).
-                self._csp_target_next[cmd.target_id] = int(float(cmd.value or 0.0))
-                # Manual CSP streaming overrides any internal trajectory generator for safety.
-                self._ruckig_requests.pop(cmd.target_id, None)
-                if self._ruckig_planner:
-                    self._ruckig_planner.stop(cmd.target_id)
-            else:
-                # PP: store target and generate a "new set-point" pulse (controlword bit 4) to latch it.
-                self.last_position_cmd[cmd.target_id] = float(cmd.value or 0.0)
-                # If a pulse is already active, force a one-cycle clear so the next cycle has a clean 0→1 edge.
-                if self._pp_pulse_active.get(cmd.target_id, False):
-                    self._pp_force_clear_cycles[cmd.target_id] = 1
-                self._pp_pulse_pending[cmd.target_id] = True
-        elif cmd.type == CommandType.START_HOMING:
-            # Switch to HM mode and issue one-cycle start
-            self.last_mode_cmd[cmd.target_id] = MODE_HM
-            # Reuse position strobe to trigger new-set-point in HM
-            self.last_position_cmd[cmd.target_id] = float(0)
-            # CiA402 homing start is typically triggered by controlword bit 4 in HM mode.
-            if self._pp_pulse_active.get(cmd.target_id, False):
-                self._pp_force_clear_cycles[cmd.target_id] = 1
-            self._pp_pulse_pending[cmd.target_id] = True
-        elif cmd.type == CommandType.ARM_PROBE:
-            probe_value = cmd.params.get('probe_function') if cmd.params else None
-            if probe_value is not None:
-                self.last_probe_arm[cmd.target_id] = int(probe_value)
-        elif cmd.type == CommandType.SET_TORQUE:
-            raw = float(cmd.value or 0.0)
-            dcfg = next((d for d in self.cfg.slaves if d.position == cmd.target_id), None)
-            cap = getattr(dcfg, 'max_torque', None)
-            if cap is None:
-                cap = 800.0
-            if abs(raw) > cap:
-                raw = cap if raw > 0 else -cap
-            self.last_torque_cmd[cmd.target_id] = raw
-        elif cmd.type == CommandType.STOP_MOTION:
-            self.last_velocity_cmd[cmd.target_id] = 0.0
-            self.last_torque_cmd[cmd.target_id] = 0.0
-            # Stop any internal trajectory as well.
-            self._ruckig_requests.pop(cmd.target_id, None)
-            if self._ruckig_planner:
-                self._ruckig_planner.stop(cmd.target_id)
-        elif cmd.type == CommandType.START_RUCKIG_POSITION:
-            # Force CSP when starting Ruckig motion
-            self.last_mode_cmd[cmd.target_id] = MODE_CSP
-            self._ruckig_requests[cmd.target_id] = {
-                "kind": "position",
-                "target": int(float(cmd.value or 0.0)),
-                "params": cmd.params or {},
-            }
-        elif cmd.type == CommandType.START_RUCKIG_VELOCITY:
-            self.last_mode_cmd[cmd.target_id] = MODE_CSP
-            self._ruckig_requests[cmd.target_id] = {
-                "kind": "velocity",
-                "target": float(cmd.value or 0.0),
-                "params": cmd.params or {},
-            }
-        elif cmd.type == CommandType.STOP_RUCKIG:
-            self._ruckig_requests.pop(cmd.target_id, None)
-            if self._ruckig_planner:
-                self._ruckig_planner.stop(cmd.target_id)
-        elif cmd.type == CommandType.START_SEMI_ROTARY_RT:
-            params = dict(cmd.params or {})
-            try:
-                comp_counts = params.get("comp_counts") or []
-                n_samples = int(params.get("n_samples") or len(comp_counts))
-                if not comp_counts or n_samples <= 0:
-                    raise ValueError("comp_counts/n_samples required")
-                die_pos = int(params["die_pos"])
-                shuttle_pos = int(params["shuttle_pos"])
-                
-                use_ruckig = params.get("use_ruckig_velocity_interface", False)
-                ruckig_integrator = None
-                nip_in_integrator = None
-                nip_out_integrator = None
-                nip_in_target_velocity = 0.0
-                nip_out_target_velocity = 0.0
-                
-                if use_ruckig and RUCKIG_AVAILABLE_CORE:
-                    try:
-                        dt_s = float(self.cfg.cycle_time_ms) / 1000.0
-                        max_velocity = float(params.get("max_velocity", 655360.0))
-                        max_acceleration = float(params.get("max_acceleration", 5000000.0))
-                        max_jerk = float(params.get("max_jerk", 20000000.0))
-                        
-                        ruckig_integrator = RuckigVelocityIntegrator(
-                            dt_s=dt_s,
-                            max_velocity=max_velocity,
-                            max_acceleration=max_acceleration,
-                            max_jerk=max_jerk
-                        )
-                        print(f"[RT-INIT] Ruckig velocity interface enabled for die: max_v={max_velocity:.0f}, max_a={max_acceleration:.0f}, max_j={max_jerk:.0f}", flush=True)
+        # Store intent; cyclic writer will realize it via PDO or SDO.
+        # READ_SDO (and any type without a handler) is accepted as a no-op.
+        handler = self._command_handlers.get(cmd.type)
+        if handler is not None:
+            handler(cmd)
+
+    def _cmd_set_velocity_mode(self, cmd: Command) -> None:
+        self.last_mode_cmd[cmd.target_id] = MODE_PV
+
+    def _cmd_set_position_mode(self, cmd: Command) -> None:
+        self.last_mode_cmd[cmd.target_id] = MODE_PP
+
+    def _cmd_set_csp_mode(self, cmd: Command) -> None:
+        self.last_mode_cmd[cmd.target_id] = MODE_CSP
+
+    def _cmd_set_torque_mode(self, cmd: Command) -> None:
+        self.last_velocity_cmd[cmd.target_id] = 0.0
+        self.last_mode_cmd[cmd.target_id] = MODE_PT
+
+    def _cmd_set_velocity(self, cmd: Command) -> None:
+        raw = float(cmd.value or 0.0)
+        dcfg = next((d for d in self.cfg.slaves if d.position == cmd.target_id), None)
+        cap = getattr(dcfg, 'max_velocity', None)
+        if cap is None:
+            cap = 500000.0
+        if abs(raw) > cap:
+            raw = cap if raw > 0 else -cap
+        self.last_velocity_cmd[cmd.target_id] = raw
+        # If this drive requires a set-point pulse to latch PV targets, schedule it.
+        dcfg = next((d for d in self.cfg.slaves if d.position == cmd.target_id), None)
+        if dcfg and getattr(dcfg, 'pv_requires_setpoint_toggle', False):
+            # If a pulse is already active, force a one-cycle clear to guarantee a fresh edge.
+            if self._pv_pulse_active.get(cmd.target_id, False):
+                self._pv_force_clear_cycles[cmd.target_id] = 1
+            self._pv_pulse_pending[cmd.target_id] = True
+
+    def _cmd_set_position(self, cmd: Command) -> None:
+        # PP: store target and generate a "new set-point" pulse (controlword bit 4) to latch it.
+        self.last_position_cmd[cmd.target_id] = float(cmd.value or 0.0)
+        # If a pulse is already active, force a one-cycle clear so the next cycle has a clean 0→1 edge.
+        if self._pp_pulse_active.get(cmd.target_id, False):
+            self._pp_force_clear_cycles[cmd.target_id] = 1
+        self._pp_pulse_pending[cmd.target_id] = True
+
+    def _cmd_set_position_csp(self, cmd: Command) -> None:
+        # CSP: do NOT mix with PP latching semantics; maintain a streaming target (atomic swap per cycle).
+        self._csp_target_next[cmd.target_id] = int(float(cmd.value or 0.0))
+        # Manual CSP streaming overrides any internal trajectory generator for safety.
+        self._ruckig_requests.pop(cmd.target_id, None)
+        if self._ruckig_planner:
+            self._ruckig_planner.stop(cmd.target_id)
+
+    def _cmd_start_homing(self, cmd: Command) -> None:
+        # Switch to HM mode and issue one-cycle start
+        self.last_mode_cmd[cmd.target_id] = MODE_HM
+        # Reuse position strobe to trigger new-set-point in HM
+        self.last_position_cmd[cmd.target_id] = float(0)
+        # CiA402 homing start is typically triggered by controlword bit 4 in HM mode.
+        if self._pp_pulse_active.get(cmd.target_id, False):
+            self._pp_force_clear_cycles[cmd.target_id] = 1
+        self._pp_pulse_pending[cmd.target_id] = True
+
+    def _cmd_arm_probe(self, cmd: Command) -> None:
+        probe_value = cmd.params.get('probe_function') if cmd.params else None
+        if probe_value is not None:
+            self.last_probe_arm[cmd.target_id] = int(probe_value)
+
+    def _cmd_set_torque(self, cmd: Command) -> None:
+        raw = float(cmd.value or 0.0)
+        dcfg = next((d for d in self.cfg.slaves if d.position == cmd.target_id), None)
+        cap = getattr(dcfg, 'max_torque', None)
+        if cap is None:
+            cap = 800.0
+        if abs(raw) > cap:
+            raw = cap if raw > 0 else -cap
+        self.last_torque_cmd[cmd.target_id] = raw
+
+    def _cmd_stop_motion(self, cmd: Command) -> None:
+        self.last_velocity_cmd[cmd.target_id] = 0.0
+        self.last_torque_cmd[cmd.target_id] = 0.0
+        # Stop any internal trajectory as well.
+        self._ruckig_requests.pop(cmd.target_id, None)
+        if self._ruckig_planner:
+            self._ruckig_planner.stop(cmd.target_id)
+
+    def _cmd_start_ruckig_position(self, cmd: Command) -> None:
+        # Force CSP when starting Ruckig motion
+        self.last_mode_cmd[cmd.target_id] = MODE_CSP
+        self._ruckig_requests[cmd.target_id] = {
+            "kind": "position",
+            "target": int(float(cmd.value or 0.0)),
+            "params": cmd.params or {},
+        }
+
+    def _cmd_start_ruckig_velocity(self, cmd: Command) -> None:
+        self.last_mode_cmd[cmd.target_id] = MODE_CSP
+        self._ruckig_requests[cmd.target_id] = {
+            "kind": "velocity",
+            "target": float(cmd.value or 0.0),
+            "params": cmd.params or {},
+        }
+
+    def _cmd_stop_ruckig(self, cmd: Command) -> None:
+        self._ruckig_requests.pop(cmd.target_id, None)
+        if self._ruckig_planner:
+            self._ruckig_planner.stop(cmd.target_id)
+
+    def _cmd_start_semi_rotary_rt(self, cmd: Command) -> None:
+        params = dict(cmd.params or {})
+        try:
+            comp_counts = params.get("comp_counts") or []
+            n_samples = int(params.get("n_samples") or len(comp_counts))
+            if not comp_counts or n_samples <= 0:
+                raise ValueError("comp_counts/n_samples required")
+            die_pos = int(params["die_pos"])
+            shuttle_pos = int(params["shuttle_pos"])
+            
+            use_ruckig = params.get("use_ruckig_velocity_interface", False)
+            ruckig_integrator = None
+            nip_in_integrator = None
+            nip_out_integrator = None
+            nip_in_target_velocity = 0.0
+            nip_out_target_velocity = 0.0
+            
+            if use_ruckig and RUCKIG_AVAILABLE_CORE:
+                try:
+                    dt_s = float(self.cfg.cycle_time_ms) / 1000.0
+                    max_velocity = float(params.get("max_velocity", 655360.0))
+                    max_acceleration = float(params.get("max_acceleration", 5000000.0))
+                    max_jerk = float(params.get("max_jerk", 20000000.0))
+                    
+                    ruckig_integrator = RuckigVelocityIntegrator(
+                        dt_s=dt_s,
+                        max_velocity=max_velocity,
+                        max_acceleration=max_acceleration,
+                        max_jerk=max_jerk
+                    )
+                    print(f"[RT-INIT] Ruckig velocity interface enabled for die: max_v={max_velocity:.0f}, max_a={max_acceleration:.0f}, max_j={max_jerk:.0f}", flush=True)
+                    
+                    if params.get("enable_nips", False):
+                        line_speed_mps = float(params.get("line_speed_mps", 0.0))
+                        nip_in_counts_per_rev = float(params.get("nip_in_counts_per_rev", 0.0))
+                        nip_out_counts_per_rev = float(params.get("nip_out_counts_per_rev", 0.0))
+                        nip_in_diameter_m = float(params.get("nip_in_roller_diameter_m", 0.1))
+                        nip_out_diameter_m = float(params.get("nip_out_roller_diameter_m", 0.1))
                         
-                        if params.get("enable_nips", False):
-                            line_speed_mps = float(params.get("line_speed_mps", 0.0))
-                            nip_in_counts_per_rev = float(params.get("nip_in_counts_per_rev", 0.0))
-                            nip_out_counts_per_rev = float(params.get("nip_out_counts_per_rev", 0.0))
-                            nip_in_diameter_m = float(params.get("nip_in_roller_diameter_m", 0.1))
-                            nip_out_diameter_m = float(params.get("nip_out_roller_diameter_m", 0.1))
+                        if line_speed_mps > 0:
+                            nip_in_target_velocity = ContinuousRotationTrajectory.calculate_nip_target_velocity(
+                                line_speed_mps=line_speed_mps,
+                                roller_diameter_m=nip_in_diameter_m,
+                                counts_per_rev=nip_in_counts_per_rev
+                            )
+                            nip_out_target_velocity = ContinuousRotationTrajectory.calculate_nip_target_velocity(
+                                line_speed_mps=line_speed_mps,
+                                roller_diameter_m=nip_out_diameter_m,
+                                counts_per_rev=nip_out_counts_per_rev
+                            )
                             
-                            if line_speed_mps > 0:
-                                nip_in_target_velocity = ContinuousRotationTrajectory.calculate_nip_target_velocity(
-                                    line_speed_mps=line_speed_mps,
-                                    roller_diameter_m=nip_in_diameter_m,
-                                    counts_per_rev=nip_in_counts_per_rev
-                                )
-                                nip_out_target_velocity = ContinuousRotationTrajectory.calculate_nip_target_velocity(
-                                    line_speed_mps=line_speed_mps,
-                                    roller_diameter_m=nip_out_diameter_m,
-                                    counts_per_rev=nip_out_counts_per_rev
-                                )
-                                
-                                nip_in_integrator = RuckigVelocityIntegrator(
-                                    dt_s=dt_s,
-                                    max_velocity=max_velocity,
-                                    max_acceleration=max_acceleration,
-                                    max_jerk=max_jerk
-                                )
-                                nip_out_integrator = RuckigVelocityIntegrator(
-                                    dt_s=dt_s,
-                                    max_velocity=max_velocity,
-                                    max_acceleration=max_acceleration,
-                                    max_jerk=max_jerk
-                                )
-                                print(f"[RT-INIT] Ruckig velocity interface enabled for nips: in_target={nip_in_target_velocity:.0f}, out_target={nip_out_target_velocity:.0f}", flush=True)
-                    except Exception as e:
-                        print(f"[RT-INIT] Ruckig init failed, falling back to linear ramp: {e}", flush=True)
-                        ruckig_integrator = None
-                        nip_in_integrator = None
-                        nip_out_integrator = None
-                
-                self._semi_rotary_rt = {
-                    "active": True,
-                    "stopping": False,
-                    "die_pos": die_pos,
-                    "shuttle_pos": shuttle_pos,
-                    "nip_in_pos": params.get("nip_in_pos"),
-                    "nip_out_pos": params.get("nip_out_pos"),
-                    "die_start": int(params["die_start"]),
-                    "shuttle_center": int(params["shuttle_center"]),
-                    "tracking_correction_kp": float(params.get("tracking_correction_kp", params.get("tracking_correction_gain", 0.0))),
-                    "tracking_correction_ki": float(params.get("tracking_correction_ki", 0.0)),
-                    "tracking_correction_max": int(params.get("tracking_correction_max", 5000)),
-                    "tracking_correction_integral_limit": int(params.get("tracking_correction_integral_limit", 10000)),
-                    "nip_in_start": int(params.get("nip_in_start") or 0),
-                    "nip_out_start": int(params.get("nip_out_start") or 0),
-                    "die_counts_per_rev": float(params["die_counts_per_rev"]),
-                    "die_velocity_counts_per_s": float(params.get("die_velocity_counts_per_s") or 0.0),
-                    "nip_in_counts_per_rev": float(params.get("nip_in_counts_per_rev") or 0.0),
-                    "nip_out_counts_per_rev": float(params.get("nip_out_counts_per_rev") or 0.0),
-                    "comp_counts": [int(v) for v in comp_counts],
-                    "n_samples": n_samples,
-                    "blend_cycles": int(params.get("blend_cycles") or 0),
-                    "cycle_count": 0,
-                    "max_shuttle_delta_per_cycle": params.get("max_shuttle_delta_per_cycle"),
-                    "max_shuttle_excursion": params.get("max_shuttle_excursion"),
-                    "shuttle_phase_lead": float(params.get("shuttle_phase_lead", 0.0)),
-                    "shuttle_velocity_feedforward": float(params.get("shuttle_velocity_feedforward", 0.0)),
-                    "offline_table_lookup": bool(params.get("offline_table_lookup", False)),
-                    "use_integer_phase": bool(params.get("use_integer_phase", False)),
-                    "enable_nips": bool(params.get("enable_nips", False)),
-                    "error": None,
-                    "die_phase_rt": None,
-                    "comp_target_rt": None,
-                    "comp_target_delta_rt": None,
-                    "rev_count_rt": None,
-                    "blend_rt": None,
-                    "comp_raw_rt": None,
-                    "ruckig_integrator": ruckig_integrator,
-                    "use_ruckig": use_ruckig and ruckig_integrator is not None,
-                    "nip_in_integrator": nip_in_integrator,
-                    "nip_out_integrator": nip_out_integrator,
-                    "nip_in_target_velocity": nip_in_target_velocity if nip_in_integrator is not None else 0.0,
-                    "nip_out_target_velocity": nip_out_target_velocity if nip_out_integrator is not None else 0.0,
-                    "active": True,
-                }
-                self.last_mode_cmd[die_pos] = MODE_CSP
-                self.last_mode_cmd[shuttle_pos] = MODE_CSP
-                kp = float(params.get("tracking_correction_kp", params.get("tracking_correction_gain", 0.0)))
-                ki = float(params.get("tracking_correction_ki", 0.0))
-                if kp > 0 or ki > 0:
-                    self._semi_rotary_rt["tracking_corrector"] = TrackingCorrector(
-                        kp=kp,
-                        ki=ki,
-                        max_correction=int(params.get("tracking_correction_max", 5000)),
-                        integral_limit=int(params.get("tracking_correction_integral_limit", 10000)),
-                    )
-                else:
-                    self._semi_rotary_rt["tracking_corrector"] = None
-                shuttle_center = int(params["shuttle_center"])
-                self._csp_target_next[shuttle_pos] = shuttle_center
-                self._csp_target_cur[shuttle_pos] = shuttle_center
-                if self._ruckig_planner:
-                    self._ruckig_planner.stop(shuttle_pos)
-                self._ruckig_last_error[die_pos] = None
-                self._ruckig_last_error[shuttle_pos] = None
-            except Exception as e:
-                self._semi_rotary_rt["active"] = False
-                self._semi_rotary_rt["error"] = str(e)
-        elif cmd.type == CommandType.UPDATE_SEMI_ROTARY_RT:
-            params = dict(cmd.params or {})
-            if self._semi_rotary_rt.get("active"):
-                if "comp_counts" in params and params["comp_counts"]:
-                    self._semi_rotary_rt["comp_counts"] = [int(v) for v in params["comp_counts"]]
-                    self._semi_rotary_rt["n_samples"] = int(params.get("n_samples") or len(self._semi_rotary_rt["comp_counts"]))
-                if "die_counts_per_rev" in params:
-                    self._semi_rotary_rt["target_counts_per_rev"] = float(params["die_counts_per_rev"])
-                if "die_velocity_counts_per_s" in params:
-                    self._semi_rotary_rt["target_velocity_counts_per_s"] = float(params["die_velocity_counts_per_s"])
-                if "phase_offset" in params:
-                    self._semi_rotary_rt["phase_offset"] = float(params["phase_offset"])
-                for key in (
-                    "blend_cycles",
-                    "max_shuttle_delta_per_cycle",
-                    "max_shuttle_excursion",
-                    "shuttle_phase_lead",
-                    "shuttle_velocity_feedforward",
-                    "offline_table_lookup",
-                    "use_integer_phase",
-                    "enable_nips",
-                    "nip_in_counts_per_rev",
-                    "nip_out_counts_per_rev",
-                    "velocity_ramp_rate",
-                ):
-                    if key in params:
-                        self._semi_rotary_rt[key] = params[key]
-                if "tracking_correction_kp" in params or "tracking_correction_gain" in params:
-                    kp = float(params.get("tracking_correction_kp", params.get("tracking_correction_gain", 0.0)))
-                    self._semi_rotary_rt["tracking_correction_kp"] = kp
-                if "tracking_correction_ki" in params:
-                    self._semi_rotary_rt["tracking_correction_ki"] = float(params["tracking_correction_ki"])
-                if "tracking_correction_max" in params:
-                    self._semi_rotary_rt["tracking_correction_max"] = int(params["tracking_correction_max"])
-                if "tracking_correction_integral_limit" in params:
-                    self._semi_rotary_rt["tracking_correction_integral_limit"] = int(params["tracking_correction_integral_limit"])
-                kp = float(self._semi_rotary_rt.get("tracking_correction_kp", 0.0))
-                ki = float(self._semi_rotary_rt.get("tracking_correction_ki", 0.0))
-                if kp > 0 or ki > 0:
-                    self._semi_rotary_rt["tracking_corrector"] = TrackingCorrector(
-                        kp=kp,
-                        ki=ki,
-                        max_correction=abs(int(self._semi_rotary_rt.get("tracking_correction_max", 5000))),
-                        integral_limit=abs(int(self._semi_rotary_rt.get("tracking_correction_integral_limit", 10000))),
-                    )
-                else:
-                    self._semi_rotary_rt["tracking_corrector"] = None
-        elif cmd.type == CommandType.STOP_SEMI_ROTARY_RT:
-            if self._semi_rotary_rt.get("active"):
-                die_pos = self._semi_rotary_rt.get("die_pos")
-                shuttle_pos = self._semi_rotary_rt.get("shuttle_pos")
-                die_enabled = self.drive_enabled.get(die_pos, False) and not self._manual_disable.get(die_pos, False)
-                shuttle_enabled = self.drive_enabled.get(shuttle_pos, False) and not self._manual_disable.get(shuttle_pos, False)
-                if die_enabled and shuttle_enabled:
-                    self._semi_rotary_rt["stopping"] = True
-                    self._semi_rotary_rt["die_velocity_counts_per_s"] = 0.0
-                    self._semi_rotary_rt["target_velocity_counts_per_s"] = 0.0
-                    print("[RT-STOP] Initiating smooth deceleration to zero velocity", flush=True)
-                else:
-                    self._semi_rotary_rt["active"] = False
-                    self._semi_rotary_rt["stopping"] = False
-                    self._semi_rotary_rt["die_velocity_counts_per_s"] = 0.0
-                    self._semi_rotary_rt["cycle_count"] = 0
-                    print("[RT-STOP] Force-stopped RT (drives not enabled)", flush=True)
-        elif cmd.type == CommandType.START_DIE_VELOCITY_TEST:
-            params = dict(cmd.params or {})
-            try:
-                die_pos = int(params["die_pos"])
-                target_rpm = float(params.get("target_rpm", 5.0))
-                counts_per_rev = float(params["die_counts_per_rev"])
-                gear_ratio = float(params.get("die_gear_ratio", 1.0))
-                direction = float(params.get("die_direction", 1.0))
-                max_velocity = float(params["max_velocity"])
-                max_acceleration = float(params["max_acceleration"])
-                max_jerk = float(params["max_jerk"])
-                dt_s = float(self.cfg.cycle_time_ms) / 1000.0
-                
-                target_velocity = direction * (target_rpm / 60.0) * counts_per_rev * gear_ratio
-                
-                if not RUCKIG_AVAILABLE_CORE:
-                    logger.error("Ruckig not available - cannot start die velocity test")
-                    return
-                
-                entries = self.offsets.get(die_pos, {})
-                if (POSITION_ACTUAL_INDEX, 0) not in entries:
-                    logger.error(f"Die velocity test requires 0x6064 (position actual) mapped in PDO for slave {die_pos}")
-                    return
-                if (VELOCITY_ACTUAL_INDEX, 0) not in entries:
-                    logger.error(f"Die velocity test requires 0x606C (velocity actual) mapped in PDO for slave {die_pos}")
-                    return
-                
-                raw_p = self.master.read_domain(self.domain, entries[(POSITION_ACTUAL_INDEX, 0)], 4) or b"\x00\x00\x00\x00"
-                raw_v = self.master.read_domain(self.domain, entries[(VELOCITY_ACTUAL_INDEX, 0)], 4) or b"\x00\x00\x00\x00"
-                current_pos = int.from_bytes(raw_p, "little", signed=True)
-                current_vel = float(int.from_bytes(raw_v, "little", signed=True))
-                
-                self._die_velocity_integrator = RuckigVelocityIntegrator(
-                    dt_s, max_velocity, max_acceleration, max_jerk
-                )
-                self._die_velocity_integrator.reset(
-                    position=float(current_pos),
-                    velocity=float(current_vel),
-                    acceleration=0.0
+                            nip_in_integrator = RuckigVelocityIntegrator(
+                                dt_s=dt_s,
+                                max_velocity=max_velocity,
+                                max_acceleration=max_acceleration,
+                                max_jerk=max_jerk
+                            )
+                            nip_out_integrator = RuckigVelocityIntegrator(
+                                dt_s=dt_s,
+                                max_velocity=max_velocity,
+                                max_acceleration=max_acceleration,
+                                max_jerk=max_jerk
+                            )
+                            print(f"[RT-INIT] Ruckig velocity interface enabled for nips: in_target={nip_in_target_velocity:.0f}, out_target={nip_out_target_velocity:.0f}", flush=True)
+                except Exception as e:
+                    print(f"[RT-INIT] Ruckig init failed, falling back to linear ramp: {e}", flush=True)
+                    ruckig_integrator = None
+                    nip_in_integrator = None
+                    nip_out_integrator = None
+            
+            self._semi_rotary_rt = {
+                "active": True,
+                "stopping": False,
+                "die_pos": die_pos,
+                "shuttle_pos": shuttle_pos,
+                "nip_in_pos": params.get("nip_in_pos"),
+                "nip_out_pos": params.get("nip_out_pos"),
+                "die_start": int(params["die_start"]),
+                "shuttle_center": int(params["shuttle_center"]),
+                "tracking_correction_kp": float(params.get("tracking_correction_kp", params.get("tracking_correction_gain", 0.0))),
+                "tracking_correction_ki": float(params.get("tracking_correction_ki", 0.0)),
+                "tracking_correction_max": int(params.get("tracking_correction_max", 5000)),
+                "tracking_correction_integral_limit": int(params.get("tracking_correction_integral_limit", 10000)),
+                "nip_in_start": int(params.get("nip_in_start") or 0),
+                "nip_out_start": int(params.get("nip_out_start") or 0),
+                "die_counts_per_rev": float(params["die_counts_per_rev"]),
+                "die_velocity_counts_per_s": float(params.get("die_velocity_counts_per_s") or 0.0),
+                "nip_in_counts_per_rev": float(params.get("nip_in_counts_per_rev") or 0.0),
+                "nip_out_counts_per_rev": float(params.get("nip_out_counts_per_rev") or 0.0),
+                "comp_counts": [int(v) for v in comp_counts],
+                "n_samples": n_samples,
+                "blend_cycles": int(params.get("blend_cycles") or 0),
+                "cycle_count": 0,
+                "max_shuttle_delta_per_cycle": params.get("max_shuttle_delta_per_cycle"),
+                "max_shuttle_excursion": params.get("max_shuttle_excursion"),
+                "shuttle_phase_lead": float(params.get("shuttle_phase_lead", 0.0)),
+                "shuttle_velocity_feedforward": float(params.get("shuttle_velocity_feedforward", 0.0)),
+                "offline_table_lookup": bool(params.get("offline_table_lookup", False)),
+                "use_integer_phase": bool(params.get("use_integer_phase", False)),
+                "enable_nips": bool(params.get("enable_nips", False)),
+                "error": None,
+                "die_phase_rt": None,
+                "comp_target_rt": None,
+                "comp_target_delta_rt": None,
+                "rev_count_rt": None,
+                "blend_rt": None,
+                "comp_raw_rt": None,
+                "ruckig_integrator": ruckig_integrator,
+                "use_ruckig": use_ruckig and ruckig_integrator is not None,
+                "nip_in_integrator": nip_in_integrator,
+                "nip_out_integrator": nip_out_integrator,
+                "nip_in_target_velocity": nip_in_target_velocity if nip_in_integrator is not None else 0.0,
+                "nip_out_target_velocity": nip_out_target_velocity if nip_out_integrator is not None else 0.0,
+                "active": True,
+            }
+            self.last_mode_cmd[die_pos] = MODE_CSP
+            self.last_mode_cmd[shuttle_pos] = MODE_CSP
+            kp = float(params.get("tracking_correction_kp", params.get("tracking_correction_gain", 0.0)))
+            ki = float(params.get("tracking_correction_ki", 0.0))
+            if kp > 0 or ki > 0:
+                self._semi_rotary_rt["tracking_corrector"] = TrackingCorrector(
+                    kp=kp,
+                    ki=ki,
+                    max_correction=int(params.get("tracking_correction_max", 5000)),
+                    integral_limit=int(params.get("tracking_correction_integral_limit", 10000)),
                 )
-                
-                self._die_test_target_rpm = target_rpm
-                self._die_test_target_velocity = target_velocity
-                self._die_test_pos = die_pos
-                self._die_velocity_test_active = True
-                self._die_velocity_test_first_cycle = True
-                
-                self.last_mode_cmd[die_pos] = MODE_CSP
-                
-                logger.info(
-                    f"Started die velocity test: pos={die_pos} rpm={target_rpm:.2f} "
-                    f"target_vel={target_velocity:.1f} counts/s current_pos={current_pos}"
+            else:
+                self._semi_rotary_rt["tracking_corrector"] = None
+            shuttle_center = int(params["shuttle_center"])
+            self._csp_target_next[shuttle_pos] = shuttle_center
+            self._csp_target_cur[shuttle_pos] = shuttle_center
+            if self._ruckig_planner:
+                self._ruckig_planner.stop(shuttle_pos)
+            self._ruckig_last_error[die_pos] = None
+            self._ruckig_last_error[shuttle_pos] = None
+        except Exception as e:
+            self._semi_rotary_rt["active"] = False
+            self._semi_rotary_rt["error"] = str(e)
+
+    def _cmd_update_semi_rotary_rt(self, cmd: Command) -> None:
+        params = dict(cmd.params or {})
+        if self._semi_rotary_rt.get("active"):
+            if "comp_counts" in params and params["comp_counts"]:
+                self._semi_rotary_rt["comp_counts"] = [int(v) for v in params["comp_counts"]]
+                self._semi_rotary_rt["n_samples"] = int(params.get("n_samples") or len(self._semi_rotary_rt["comp_counts"]))
+            if "die_counts_per_rev" in params:
+                self._semi_rotary_rt["target_counts_per_rev"] = float(params["die_counts_per_rev"])
+            if "die_velocity_counts_per_s" in params:
+                self._semi_rotary_rt["target_velocity_counts_per_s"] = float(params["die_velocity_counts_per_s"])
+            if "phase_offset" in params:
+                self._semi_rotary_rt["phase_offset"] = float(params["phase_offset"])
+            for key in (
+                "blend_cycles",
+                "max_shuttle_delta_per_cycle",
+                "max_shuttle_excursion",
+                "shuttle_phase_lead",
+                "shuttle_velocity_feedforward",
+                "offline_table_lookup",
+                "use_integer_phase",
+                "enable_nips",
+                "nip_in_counts_per_rev",
+                "nip_out_counts_per_rev",
+                "velocity_ramp_rate",
+            ):
+                if key in params:
+                    self._semi_rotary_rt[key] = params[key]
+            if "tracking_correction_kp" in params or "tracking_correction_gain" in params:
+                kp = float(params.get("tracking_correction_kp", params.get("tracking_correction_gain", 0.0)))
+                self._semi_rotary_rt["tracking_correction_kp"] = kp
+            if "tracking_correction_ki" in params:
+                self._semi_rotary_rt["tracking_correction_ki"] = float(params["tracking_correction_ki"])
+            if "tracking_correction_max" in params:
+                self._semi_rotary_rt["tracking_correction_max"] = int(params["tracking_correction_max"])
+            if "tracking_correction_integral_limit" in params:
+                self._semi_rotary_rt["tracking_correction_integral_limit"] = int(params["tracking_correction_integral_limit"])
+            kp = float(self._semi_rotary_rt.get("tracking_correction_kp", 0.0))
+            ki = float(self._semi_rotary_rt.get("tracking_correction_ki", 0.0))
+            if kp > 0 or ki > 0:
+                self._semi_rotary_rt["tracking_corrector"] = TrackingCorrector(
+                    kp=kp,
+                    ki=ki,
+                    max_correction=abs(int(self._semi_rotary_rt.get("tracking_correction_max", 5000))),
+                    integral_limit=abs(int(self._semi_rotary_rt.get("tracking_correction_integral_limit", 10000))),
                 )
-            except Exception as e:
-                logger.error(f"Failed to start die velocity test: {e}")
-                self._die_velocity_test_active = False
-        elif cmd.type == CommandType.STOP_DIE_VELOCITY_TEST:
-            if self._die_velocity_test_active:
-                logger.info("Stopping die velocity test")
-                self._die_velocity_test_active = False
-                self._die_velocity_integrator = None
-        elif cmd.type == CommandType.DISABLE_PROBE:
-            # Clear probe function on device (will be applied once in cyclic)
-            self.last_probe_arm[cmd.target_id] = 0
-        elif cmd.type == CommandType.ENABLE_DRIVE:
-            self._manual_disable[cmd.target_id] = False
-            self._enable_requested[cmd.target_id] = True
-            self._emit_process_log(
-                f"[EC][CIA402] enable requested slave={cmd.target_id} "
-                f"manual_disable={self._manual_disable.get(cmd.target_id, False)} "
-                f"enable_requested={self._enable_requested.get(cmd.target_id, False)} "
-                f"in_op={self.slave_in_op.get(cmd.target_id, False)}"
+            else:
+                self._semi_rotary_rt["tracking_corrector"] = None
+
+    def _cmd_stop_semi_rotary_rt(self, cmd: Command) -> None:
+        if self._semi_rotary_rt.get("active"):
+            die_pos = self._semi_rotary_rt.get("die_pos")
+            shuttle_pos = self._semi_rotary_rt.get("shuttle_pos")
+            die_enabled = self.drive_enabled.get(die_pos, False) and not self._manual_disable.get(die_pos, False)
+            shuttle_enabled = self.drive_enabled.get(shuttle_pos, False) and not self._manual_disable.get(shuttle_pos, False)
+            if die_enabled and shuttle_enabled:
+                self._semi_rotary_rt["stopping"] = True
+                self._semi_rotary_rt["die_velocity_counts_per_s"] = 0.0
+                self._semi_rotary_rt["target_velocity_counts_per_s"] = 0.0
+                print("[RT-STOP] Initiating smooth deceleration to zero velocity", flush=True)
+            else:
+                self._semi_rotary_rt["active"] = False
+                self._semi_rotary_rt["stopping"] = False
+                self._semi_rotary_rt["die_velocity_counts_per_s"] = 0.0
+                self._semi_rotary_rt["cycle_count"] = 0
+                print("[RT-STOP] Force-stopped RT (drives not enabled)", flush=True)
+
+    def _cmd_start_die_velocity_test(self, cmd: Command) -> None:
+        params = dict(cmd.params or {})
+        try:
+            die_pos = int(params["die_pos"])
+            target_rpm = float(params.get("target_rpm", 5.0))
+            counts_per_rev = float(params["die_counts_per_rev"])
+            gear_ratio = float(params.get("die_gear_ratio", 1.0))
+            direction = float(params.get("die_direction", 1.0))
+            max_velocity = float(params["max_velocity"])
+            max_acceleration = float(params["max_acceleration"])
+            max_jerk = float(params["max_jerk"])
+            dt_s = float(self.cfg.cycle_time_ms) / 1000.0
+            
+            target_velocity = direction * (target_rpm / 60.0) * counts_per_rev * gear_ratio
+            
+            if not RUCKIG_AVAILABLE_CORE:
+                logger.error("Ruckig not available - cannot start die velocity test")
+                return
+            
+            entries = self.offsets.get(die_pos, {})
+            if (POSITION_ACTUAL_INDEX, 0) not in entries:
+                logger.error("Die velocity test requires 0x6064 (position actual) mapped in PDO for slave %s", die_pos)
+                return
+            if (VELOCITY_ACTUAL_INDEX, 0) not in entries:
+                logger.error("Die velocity test requires 0x606C (velocity actual) mapped in PDO for slave %s", die_pos)
+                return
+            
+            raw_p = self.master.read_domain(self.domain, entries[(POSITION_ACTUAL_INDEX, 0)], 4) or b"\x00\x00\x00\x00"
+            raw_v = self.master.read_domain(self.domain, entries[(VELOCITY_ACTUAL_INDEX, 0)], 4) or b"\x00\x00\x00\x00"
+            current_pos = int.from_bytes(raw_p, "little", signed=True)
+            current_vel = float(int.from_bytes(raw_v, "little", signed=True))
+            
+            self._die_velocity_integrator = RuckigVelocityIntegrator(
+                dt_s, max_velocity, max_acceleration, max_jerk
             )
-        elif cmd.type == CommandType.DISABLE_DRIVE:
-            self._manual_disable[cmd.target_id] = True
-            self._enable_requested[cmd.target_id] = False
-            self._emit_process_log(
-                f"[EC][CIA402] disable requested slave={cmd.target_id} "
-                f"manual_disable={self._manual_disable.get(cmd.target_id, False)} "
-                f"enable_requested={self._enable_requested.get(cmd.target_id, False)}"
+            self._die_velocity_integrator.reset(
+                position=float(current_pos),
+                velocity=float(current_vel),
+                acceleration=0.0
             )
-            # Force the state machine back toward disabled
-            self.desired_controlword[cmd.target_id] = 0x0000  # Disable voltage
-            self.drive_enabled[cmd.target_id] = False
-            # Clear any in-flight pulses (must re-strobe after re-enable)
-            self._pp_pulse_active[cmd.target_id] = False
-            self._pp_pulse_start_ns[cmd.target_id] = None
-            self._pp_pulse_pending[cmd.target_id] = False
-            self._pv_pulse_active[cmd.target_id] = False
-            self._pv_pulse_start_ns[cmd.target_id] = None
-            self._pv_pulse_pending[cmd.target_id] = False
-            # Clear CSP targets so re-enable seeds with fresh actual position
-            self._csp_target_cur.pop(cmd.target_id, None)
-            self._csp_target_next.pop(cmd.target_id, None)
-            # Stop semi_rotary_rt if this is the die or shuttle being disabled
-            rt = self._semi_rotary_rt
-            if rt.get("active"):
-                die_pos = rt.get("die_pos")
-                shuttle_pos = rt.get("shuttle_pos")
-                if cmd.target_id in (die_pos, shuttle_pos):
-                    rt["active"] = False
-                    rt["stopping"] = False
-                    rt["die_velocity_counts_per_s"] = 0.0
-                    rt["cycle_count"] = 0
-                    self._emit_process_log(
-                        f"[EC][RT] semi_rotary_rt deactivated due to drive {cmd.target_id} disable"
-                    )
-        elif cmd.type == CommandType.WRITE_RAW_PDO:
-            pos = cmd.target_id
-            key = (cmd.params["index"], cmd.params["subindex"])
-            self._raw_pdo_writes.setdefault(pos, {})[key] = cmd.value
-        elif cmd.type == CommandType.READ_SDO:
-            pass
-        elif cmd.type == CommandType.WRITE_SDO:
-            index = cmd.params.get("index")
-            subindex = cmd.params.get("subindex", 0)
-            try:
-                if index is None:
-                    raise ValueError("missing index")
-                if not self._sdo_mgr.has(int(cmd.target_id), int(index), int(subindex)):
-                    raise ValueError("no SDO request object registered for this index/subindex")
-                self._sdo_mgr.set_desired_write(int(cmd.target_id), int(index), int(subindex), bytes(cmd.value))
-            except Exception as e:
-                logger.error(f"SDO write schedule failed: slave={cmd.target_id} 0x{int(index or 0):04X}:{int(subindex)}: {e}")
+            
+            self._die_test_target_rpm = target_rpm
+            self._die_test_target_velocity = target_velocity
+            self._die_test_pos = die_pos
+            self._die_velocity_test_active = True
+            self._die_velocity_test_first_cycle = True
+            
+            self.last_mode_cmd[die_pos] = MODE_CSP
+            
+            logger.info(
+                "Started die velocity test: pos=%s rpm=%.2f "
+                "target_vel=%.1f counts/s current_pos=%s",
+                die_pos, target_rpm, target_velocity, current_pos
+            )
+        except Exception as e:
+            logger.error("Failed to start die velocity test: %s", e)
+            self._die_velocity_test_active = False
+
+    def _cmd_stop_die_velocity_test(self, cmd: Command) -> None:
+        if self._die_velocity_test_active:
+            logger.info("Stopping die velocity test")
+            self._die_velocity_test_active = False
+            self._die_velocity_integrator = None
+
+    def _cmd_disable_probe(self, cmd: Command) -> None:
+        # Clear probe function on device (will be applied once in cyclic)
+        self.last_probe_arm[cmd.target_id] = PROBE1_DISABLE
+
+    def _cmd_enable_drive(self, cmd: Command) -> None:
+        self._manual_disable[cmd.target_id] = False
+        self._enable_requested[cmd.target_id] = True
+        self._emit_process_log(
+            f"[EC][CIA402] enable requested slave={cmd.target_id} "
+            f"manual_disable={self._manual_disable.get(cmd.target_id, False)} "
+            f"enable_requested={self._enable_requested.get(cmd.target_id, False)} "
+            f"in_op={self.slave_in_op.get(cmd.target_id, False)}"
+        )
+
+    def _cmd_disable_drive(self, cmd: Command) -> None:
+        self._manual_disable[cmd.target_id] = True
+        self._enable_requested[cmd.target_id] = False
+        self._emit_process_log(
+            f"[EC][CIA402] disable requested slave={cmd.target_id} "
+            f"manual_disable={self._manual_disable.get(cmd.target_id, False)} "
+            f"enable_requested={self._enable_requested.get(cmd.target_id, False)}"
+        )
+        # Force the state machine back toward disabled
+        self.desired_controlword[cmd.target_id] = 0x0000  # Disable voltage
+        self.drive_enabled[cmd.target_id] = False
+        # Clear any in-flight pulses (must re-strobe after re-enable)
+        self._pp_pulse_active[cmd.target_id] = False
+        self._pp_pulse_start_ns[cmd.target_id] = None
+        self._pp_pulse_pending[cmd.target_id] = False
+        self._pv_pulse_active[cmd.target_id] = False
+        self._pv_pulse_start_ns[cmd.target_id] = None
+        self._pv_pulse_pending[cmd.target_id] = False
+        # Clear CSP targets so re-enable seeds with fresh actual position
+        self._csp_target_cur.pop(cmd.target_id, None)
+        self._csp_target_next.pop(cmd.target_id, None)
+        if self._targets_shm is not None and 0 <= cmd.target_id < SHM.MAX_DRIVES:
+            self._targets_shm[SHM.TARGET_BASE + cmd.target_id * SHM.TARGET_STRIDE + SHM.TARGET_VALID] = 0
+        # Stop semi_rotary_rt if this is the die or shuttle being disabled
+        rt = self._semi_rotary_rt
+        if rt.get("active"):
+            die_pos = rt.get("die_pos")
+            shuttle_pos = rt.get("shuttle_pos")
+            if cmd.target_id in (die_pos, shuttle_pos):
+                rt["active"] = False
+                rt["stopping"] = False
+                rt["die_velocity_counts_per_s"] = 0.0
+                rt["cycle_count"] = 0
+                self._emit_process_log(
+                    f"[EC][RT] semi_rotary_rt deactivated due to drive {cmd.target_id} disable"
+                )
+
+    def _cmd_write_raw_pdo(self, cmd: Command) -> None:
+        pos = cmd.target_id
+        params = cmd.params or {}
+        key = (params["index"], params["subindex"])
+        self._raw_pdo_writes.setdefault(pos, {})[key] = cmd.value
+
+    def _cmd_write_sdo(self, cmd: Command) -> None:
+        params = cmd.params or {}
+        index = params.get("index")
+        subindex = params.get("subindex", 0)
+        try:
+            if index is None:
+                raise ValueError("missing index")
+            if not self._sdo_mgr.has(int(cmd.target_id), int(index), int(subindex)):
+                raise ValueError("no SDO request object registered for this index/subindex")
+            self._sdo_mgr.set_desired_write(int(cmd.target_id), int(index), int(subindex), bytes(cmd.value))
+        except Exception as e:
+            logger.error("SDO write schedule failed: slave=%s 0x%04X:%s: %s", cmd.target_id, int(index or 0), int(subindex), e)
 
     def _auto_enable_drives(self):
         """
@@ -1869,7 +2137,7 @@ class EtherCATProcess:
             
             # Decode CiA 402 state from statusword
             # Check for FAULT first (bit 3 set)
-            if statusword & 0x0008:
+            if statusword & SW_MASK_FAULT:
                 error_code, error_code_source = self._read_fault_error_code(slave_pos, entries)
                 was_fault = bool(self._fault_active_last.get(slave_pos, False))
                 prev_code = self._fault_error_code_last.get(slave_pos)
@@ -1888,7 +2156,7 @@ class EtherCATProcess:
                 step = self.enable_step.get(slave_pos, 0)
                 if step < 10:  # Limit fault reset attempts
                     # Set FAULT_RESET controlword
-                    self.desired_controlword[slave_pos] = 0x0080
+                    self.desired_controlword[slave_pos] = CW_FAULT_RESET
                     self.enable_step[slave_pos] = step + 1
                     self.enable_last_action_ns[slave_pos] = now_ns
                     self._emit_process_log(
@@ -1896,7 +2164,7 @@ class EtherCATProcess:
                         f"action=FAULT_RESET cw=0x0080 attempt={step + 1}"
                     )
                     if step == 0:
-                        logger.info(f"Slave {slave_pos}: sending FAULT_RESET")
+                        logger.info("Slave %s: sending FAULT_RESET", slave_pos)
                 continue  # Move to next slave
             else:
                 self._fault_active_last[slave_pos] = False
@@ -1907,15 +2175,15 @@ class EtherCATProcess:
                     pass
             
             # Determine current state using CiA 402 standard bit patterns
-            state_bits = statusword & 0x006F
+            state = SW_STATE_LUT[statusword & 0x7F]
             
             # Operation Enabled: xxxx xxxx x01x 0111
-            if state_bits == 0x0027:
+            if state == CiA402State.OPERATION_ENABLED:
                 # Already enabled - set controlword to maintain enabled state
-                self.desired_controlword[slave_pos] = 0x000F  # ENABLE_OPERATION
+                self.desired_controlword[slave_pos] = CW_NEXT[state]  # ENABLE_OPERATION
                 if not self.drive_enabled.get(slave_pos, False):
                     self.drive_enabled[slave_pos] = True
-                    logger.info(f"✓ Slave {slave_pos}: ENABLED (0x{statusword:04X})")
+                    logger.info("✓ Slave %s: ENABLED (0x%04X)", slave_pos, statusword)
                     self._emit_process_log(
                         f"[EC][CIA402] slave={slave_pos} sw=0x{statusword:04X} "
                         "state=OPERATION_ENABLED enabled=true"
@@ -1925,7 +2193,7 @@ class EtherCATProcess:
                 continue  # Move to next slave
             
             # Switched On: xxxx xxxx x01x 0011
-            elif state_bits == 0x0023:
+            elif state == CiA402State.SWITCHED_ON:
                 # Seed CSP target with actual position BEFORE enabling to prevent jump
                 if slave_pos not in self._csp_target_cur:
                     if (POSITION_ACTUAL_INDEX, 0) in entries:
@@ -1937,39 +2205,42 @@ class EtherCATProcess:
                             f"[EC][CIA402] slave={slave_pos} seeded CSP target={actual_pos} before enable"
                         )
                 # Send ENABLE_OPERATION (0x000F)
-                self.desired_controlword[slave_pos] = 0x000F
+                self.desired_controlword[slave_pos] = CW_NEXT[state]
                 self.enable_last_action_ns[slave_pos] = now_ns
                 self._emit_process_log(
                     f"[EC][CIA402] slave={slave_pos} sw=0x{statusword:04X} "
                     "state=SWITCHED_ON action=ENABLE_OPERATION cw=0x000F"
                 )
-                logger.info(f"Slave {slave_pos}: SWITCHED_ON (0x{statusword:04X}) → ENABLE_OPERATION")
+                logger.info("Slave %s: SWITCHED_ON (0x%04X) → ENABLE_OPERATION", slave_pos, statusword)
             
             # Ready to Switch On: xxxx xxxx x00x 0001
-            elif state_bits == 0x0021:
+            elif state == CiA402State.READY_TO_SWITCH_ON:
                 # Send SWITCH_ON (0x0007)
-                self.desired_controlword[slave_pos] = 0x0007
+                self.desired_controlword[slave_pos] = CW_NEXT[state]
                 self.enable_last_action_ns[slave_pos] = now_ns
                 self._emit_process_log(
                     f"[EC][CIA402] slave={slave_pos} sw=0x{statusword:04X} "
                     "state=READY_TO_SWITCH_ON action=SWITCH_ON cw=0x0007"
                 )
-                logger.info(f"Slave {slave_pos}: READY_TO_SWITCH_ON (0x{statusword:04X}) → SWITCH_ON")
+                logger.info("Slave %s: READY_TO_SWITCH_ON (0x%04X) → SWITCH_ON", slave_pos, statusword)
             
             # Switch On Disabled: xxxx xxxx x1xx 0000
-            elif (statusword & 0x004F) == 0x0040:
+            elif state == CiA402State.SWITCH_ON_DISABLED:
                 # Send SHUTDOWN (0x0006)
-                self.desired_controlword[slave_pos] = 0x0006
+                self.desired_controlword[slave_pos] = CW_NEXT[state]
                 self.enable_last_action_ns[slave_pos] = now_ns
                 self._emit_process_log(
                     f"[EC][CIA402] slave={slave_pos} sw=0x{statusword:04X} "
                     "state=SWITCH_ON_DISABLED action=SHUTDOWN cw=0x0006"
                 )
-                logger.info(f"Slave {slave_pos}: SWITCH_ON_DISABLED (0x{statusword:04X}) → SHUTDOWN")
+                logger.info("Slave %s: SWITCH_ON_DISABLED (0x%04X) → SHUTDOWN", slave_pos, statusword)
             else:
                 # Unknown state - log for debugging
                 if self.cycle_count % 200 == 0:  # Log occasionally
-                    logger.warning(f"Slave {slave_pos}: Unknown state - statusword 0x{statusword:04X}, state_bits 0x{state_bits:04X}")
+                    logger.warning(
+                        "Slave %s: Unknown state - statusword 0x%04X, state_bits 0x%04X",
+                        slave_pos, statusword, statusword & SW_STATE_MASK,
+                    )
     
     def _publish_status(self):
         status = NetworkStatus(drives={})
@@ -2025,8 +2296,9 @@ class EtherCATProcess:
                     slaves_missing = [p for p, in_op in self.slave_in_op.items() if not in_op]
                     
                     logger.warning(
-                        f"[EC] WC {wc}/{self._wc_expected} (missing {missing} slaves). "
-                        f"Not in OP: {slaves_missing}. Check dmesg for 'Synchronization error'."
+                        "[EC] WC %s/%s (missing %s slaves). "
+                        "Not in OP: %s. Check dmesg for 'Synchronization error'.",
+                        wc, self._wc_expected, missing, slaves_missing
                     )
                     self._last_wc_alert_cycle = self.cycle_count
         
@@ -2037,7 +2309,7 @@ class EtherCATProcess:
         # === NON-RT MONITORING: RT Budget Usage ===
         work_ns = self._last_work_ns
         if work_ns is not None:
-            cycle_budget_ns = int(self.cfg.cycle_time_ms * 1_000_000)
+            cycle_budget_ns = self._cycle_budget_ns
             usage_percent = (work_ns / cycle_budget_ns) * 100.0
             
             # Alert if using >85% of budget
@@ -2046,9 +2318,10 @@ class EtherCATProcess:
                 
                 if (self.cycle_count - self._last_rt_alert_cycle) >= 1000:
                     logger.warning(
-                        f"[EC] RT budget {usage_percent:.1f}% "
-                        f"(work={work_ns/1000:.1f}us / budget={cycle_budget_ns/1000:.1f}us). "
-                        f"Datagrams may be skipped!"
+                        "[EC] RT budget %.1f%% "
+                        "(work=%.1fus / budget=%.1fus). "
+                        "Datagrams may be skipped!",
+                        usage_percent, work_ns / 1000, cycle_budget_ns / 1000
                     )
                     self._last_rt_alert_cycle = self.cycle_count
             
@@ -2094,13 +2367,12 @@ class EtherCATProcess:
                     sys.stdout.write(f"[SHM-DEBUG] Slave 3 cycle {self.cycle_count}: statusword offset={entries[(SW_INDEX, 0)]} raw={raw.hex()} value=0x{sw:04X}\n")
                     sys.stdout.flush()
                 # Derived semantics (no extra bus access)
-                state_bits = sw & 0x006F
-                drive['enabled'] = (state_bits == 0x0027) and not self._manual_disable.get(slave_pos, False)
-                drive['fault'] = bool(sw & 0x0008)
-                drive['warning'] = bool(sw & 0x0080)
-                drive['target_reached'] = bool(sw & 0x0400)
-                drive['internal_limit_active'] = bool(sw & 0x0800)
-                drive['setpoint_ack'] = bool(sw & 0x1000)
+                drive['enabled'] = (SW_STATE_LUT[sw & 0x7F] == CiA402State.OPERATION_ENABLED) and not self._manual_disable.get(slave_pos, False)
+                drive['fault'] = bool(sw & SW_MASK_FAULT)
+                drive['warning'] = bool(sw & SW_MASK_WARNING)
+                drive['target_reached'] = bool(sw & SW_MASK_TARGET_REACHED)
+                drive['internal_limit_active'] = bool(sw & SW_MASK_INTERNAL_LIMIT_ACTIVE)
+                drive['setpoint_ack'] = bool(sw & SW_MASK_SETPOINT_ACK)
                 # Intent flags
                 drive['enable_requested'] = self._enable_requested.get(slave_pos, True)
                 drive['manual_disable'] = self._manual_disable.get(slave_pos, False)
@@ -2241,13 +2513,14 @@ class EtherCATProcess:
                     prev = self._last_mode_sdo.get(slave_pos)
                     if mode != prev:
                         logger.warning(
-                            f"Slave {slave_pos}: {hex(MODES_OP_INDEX)} not in PDO; scheduling mode={mode} via SDO request object"
+                            "Slave %s: %#x not in PDO; scheduling mode=%s via SDO request object",
+                            slave_pos, MODES_OP_INDEX, MODE_NAME.get(mode, mode),
                         )
                         self._last_mode_sdo[slave_pos] = mode
                         if self._sdo_mgr.has(slave_pos, MODES_OP_INDEX, 0):
                             self._sdo_mgr.set_desired_write(slave_pos, MODES_OP_INDEX, 0, bytes([int(mode) & 0xFF]))
                         else:
-                            logger.error(f"Slave {slave_pos}: no SDO request object for {hex(MODES_OP_INDEX)}:0")
+                            logger.error("Slave %s: no SDO request object for %#x:0", slave_pos, MODES_OP_INDEX)
 
             motion_ok = self.drive_enabled.get(slave_pos, False) and not self._manual_disable.get(slave_pos, False)
             mode_eff = mode if mode is not None else self._default_mode.get(slave_pos)
@@ -2265,7 +2538,7 @@ class EtherCATProcess:
                         prev = self._last_velocity_sdo.get(slave_pos)
                         if v != prev:
                             logger.info(
-                                f"Slave {slave_pos}: {hex(TARGET_VELOCITY_INDEX)} not in PDO; scheduling vel={v} via SDO request object"
+                                "Slave %s: %#x not in PDO; scheduling vel=%s via SDO request object", slave_pos, TARGET_VELOCITY_INDEX, v
                             )
                             self._last_velocity_sdo[slave_pos] = v
                             if self._sdo_mgr.has(slave_pos, TARGET_VELOCITY_INDEX, 0):
@@ -2276,7 +2549,7 @@ class EtherCATProcess:
                                     v.to_bytes(4, 'little', signed=True),
                                 )
                             else:
-                                logger.error(f"Slave {slave_pos}: no SDO request object for {hex(TARGET_VELOCITY_INDEX)}:0")
+                                logger.error("Slave %s: no SDO request object for %#x:0", slave_pos, TARGET_VELOCITY_INDEX)
                     if mode_eff != MODE_PT and self._pv_pulse_pending.get(slave_pos, False) and self._pv_pulse_active.get(slave_pos, False):
                         self._pv_pulse_pending[slave_pos] = False
 
@@ -2289,7 +2562,7 @@ class EtherCATProcess:
                     prev = self._last_torque_sdo.get(slave_pos)
                     if t != prev:
                         logger.info(
-                            f"Slave {slave_pos}: {hex(TARGET_TORQUE_INDEX)} not in PDO; scheduling torque={t} via SDO request object"
+                            "Slave %s: %#x not in PDO; scheduling torque=%s via SDO request object", slave_pos, TARGET_TORQUE_INDEX, t
                         )
                         self._last_torque_sdo[slave_pos] = t
                         if self._sdo_mgr.has(slave_pos, TARGET_TORQUE_INDEX, 0):
@@ -2300,7 +2573,7 @@ class EtherCATProcess:
                                 t.to_bytes(2, 'little', signed=True),
                             )
                         else:
-                            logger.error(f"Slave {slave_pos}: no SDO request object for {hex(TARGET_TORQUE_INDEX)}:0")
+                            logger.error("Slave %s: no SDO request object for %#x:0", slave_pos, TARGET_TORQUE_INDEX)
 
             # Maintain target position (0x607A)
             # - PP/HM: write the last commanded target (latch with bit4 pulse below)
@@ -2329,7 +2602,7 @@ class EtherCATProcess:
                     key = (TARGET_POSITION_INDEX, 0)
                     if key not in warned:
                         logger.warning(
-                            f"Slave {slave_pos}: {hex(TARGET_POSITION_INDEX)} not in PDO; scheduling via SDO request object"
+                            "Slave %s: %#x not in PDO; scheduling via SDO request object", slave_pos, TARGET_POSITION_INDEX
                         )
                         warned.add(key)
                     prev = self._last_position_sdo.get(slave_pos)
@@ -2343,7 +2616,7 @@ class EtherCATProcess:
                                 p.to_bytes(4, "little", signed=True),
                             )
                         else:
-                            logger.error(f"Slave {slave_pos}: no SDO request object for {hex(TARGET_POSITION_INDEX)}:0")
+                            logger.error("Slave %s: no SDO request object for %#x:0", slave_pos, TARGET_POSITION_INDEX)
 
             # Controlword bit maintenance (0x6040):
             # Build controlword from desired state machine value + motion bits
@@ -2374,8 +2647,8 @@ class EtherCATProcess:
 
                     # Update/clear PP pulse state (only after we've asserted bit 4 at least once).
                     if self._pp_pulse_active.get(slave_pos, False):
-                        ack_mask = int(self.cfg.pp_ack_mask)
-                        timeout_ns = int(max(self.cfg.pp_ack_timeout_ms, 1.0) * 1_000_000)
+                        ack_mask = self._pp_ack_mask
+                        timeout_ns = self._pp_ack_timeout_ns
                         start_ns = self._pp_pulse_start_ns.get(slave_pos) or 0
                         now_ns = time.monotonic_ns()
                         acked = bool(statusword is not None and (statusword & ack_mask))
@@ -2388,8 +2661,8 @@ class EtherCATProcess:
 
                     # Update/clear PV pulse state (optional; mirrors PP ack/timeout semantics).
                     if self._pv_pulse_active.get(slave_pos, False):
-                        ack_mask = int(self.cfg.pp_ack_mask)
-                        timeout_ns = int(max(self.cfg.pp_ack_timeout_ms, 1.0) * 1_000_000)
+                        ack_mask = self._pp_ack_mask
+                        timeout_ns = self._pp_ack_timeout_ns
                         start_ns = self._pv_pulse_start_ns.get(slave_pos) or 0
                         now_ns = time.monotonic_ns()
                         acked = bool(statusword is not None and (statusword & ack_mask))
@@ -2437,11 +2710,11 @@ class EtherCATProcess:
                                     self._pv_pulse_active[slave_pos] = True
                                     self._pv_pulse_start_ns[slave_pos] = time.monotonic_ns()
                     
-                    self.master.write_domain(self.domain, cw_offset, cw.to_bytes(2, byteorder='little'))
+                    self.master.write_domain(self.domain, cw_offset, _U16_LE.get(cw) or _u16_le(cw))
 
             if (PROBE_FUNCTION_INDEX, 0) in entries:
                 probe_val = self.last_probe_arm.get(slave_pos)
-                val = (int(probe_val) if probe_val is not None else 0).to_bytes(2, 'little')
+                val = _u16_le(int(probe_val) if probe_val is not None else 0)
                 self.master.write_domain(self.domain, entries[(PROBE_FUNCTION_INDEX, 0)], val)
                 if probe_val is not None:
                     self.last_probe_arm[slave_pos] = None
@@ -2452,7 +2725,7 @@ class EtherCATProcess:
                     key = (PROBE_FUNCTION_INDEX, 0)
                     if key not in warned:
                         logger.warning(
-                            f"Slave {slave_pos}: {hex(PROBE_FUNCTION_INDEX)} not in PDO; scheduling via SDO request object"
+                            "Slave %s: %#x not in PDO; scheduling via SDO request object", slave_pos, PROBE_FUNCTION_INDEX
                         )
                         warned.add(key)
                     if self._sdo_mgr.has(slave_pos, PROBE_FUNCTION_INDEX, 0):
@@ -2463,7 +2736,7 @@ class EtherCATProcess:
                             int(probe_val).to_bytes(2, "little"),
                         )
                     else:
-                        logger.error(f"Slave {slave_pos}: no SDO request object for {hex(PROBE_FUNCTION_INDEX)}:0")
+                        logger.error("Slave %s: no SDO request object for %#x:0", slave_pos, PROBE_FUNCTION_INDEX)
                     self.last_probe_arm[slave_pos] = None
 
     def _update_die_velocity_test(self) -> None:
@@ -2500,7 +2773,7 @@ class EtherCATProcess:
             
             self._csp_target_next[die_pos] = int(round(position))
         except Exception as e:
-            logger.error(f"Die velocity test update failed: {e}")
+            logger.error("Die velocity test update failed: %s", e)
             self._die_velocity_test_active = False
     
     def _update_semi_rotary_rt(self) -> None:
@@ -2612,7 +2885,7 @@ class EtherCATProcess:
                 print(f"[RT-INIT] Shuttle feedforward: phase_lead={phase_lead} velocity_feedforward={vel_ff}", flush=True)
         
         die_commanded = rt.get("die_commanded_position", die_actual)
-        dt_s = float(self.cfg.cycle_time_ms) / 1000.0
+        dt_s = self._cycle_dt_s
         
         current_velocity = 0.0
         if use_ruckig and ruckig_integrator is not None:
@@ -2734,7 +3007,7 @@ class EtherCATProcess:
             if die_vel != 0 and abs_counts_per_rev > 0:
                 die_phase_rate = die_vel / abs_counts_per_rev
                 target_vel_counts_per_s = dcomp_dphase * die_phase_rate
-                dt_s = float(self.cfg.cycle_time_ms) / 1000.0
+                dt_s = self._cycle_dt_s
                 ff_counts = int(round(velocity_ff_gain * target_vel_counts_per_s))
                 comp_target = int(comp_target) + ff_counts
         comp_target = int(comp_target)
@@ -2757,7 +3030,7 @@ class EtherCATProcess:
                 shuttle_actual = int.from_bytes(raw_s, "little", signed=True)
         corrector = rt.get("tracking_corrector")
         if corrector is not None and shuttle_actual is not None:
-            dt_s = float(self.cfg.cycle_time_ms) / 1000.0
+            dt_s = self._cycle_dt_s
             comp_target = corrector.step(int(comp_target), shuttle_actual, dt_s)
             if max_excursion is not None:
                 max_exc = abs(int(max_excursion))
@@ -2847,7 +3120,7 @@ class EtherCATProcess:
         if self.cfg.sdo_only or self.domain is None:
             return
 
-        dt_s_fallback = float(self.cfg.cycle_time_ms) / 1000.0
+        dt_s_fallback = self._cycle_dt_s
 
         for dcfg in self.cfg.slaves:
             pos = dcfg.position
@@ -3018,6 +3291,11 @@ class EtherCATProcess:
             raise
 
     def _run_inner(self):
+        self._cmd_reader = _CommandPipeReader(self.cmd_conn)
+        if self._actuals_raw is not None:
+            self._actuals_shm = SHM.aligned_view(self._actuals_raw, SHM.ACTUALS_SIZE)
+        if self._targets_raw is not None:
+            self._targets_shm = SHM.aligned_view(self._targets_raw, SHM.TARGETS_SIZE)
         self._install_signal_handlers()
         self._apply_irq_affinity()
 
@@ -3062,7 +3340,6 @@ class EtherCATProcess:
         except Exception as e:
             self._emit_process_log(f"[EC] clock_nanosleep unavailable, falling back to time.sleep: {e}", stderr=True)
 
-        import threading
         self._log_q = queue.Queue(maxsize=256)
 
         def _log_writer():
@@ -3187,12 +3464,7 @@ class EtherCATProcess:
                 self.cycle_count += 1
                 next_cycle_mono += cycle_ns
 
-                for _ in range(16):
-                    try:
-                        cmd = self.cmd_q.get_nowait()
-                        self._handle_command(cmd)
-                    except queue.Empty:
-                        break
+                self._drain_commands()
 
                 if not self.cfg.sdo_only and self.domain is not None:
                     _t0 = time.monotonic_ns()
@@ -3482,21 +3754,76 @@ class EtherCATProcessManager:
 
     def __init__(self, cfg: EthercatNetworkConfig):
         self.cfg = cfg
-        self._cmd_q: mp.Queue = mp.Queue(maxsize=1024)
+        # One-way pipe written directly by send_command (no feeder thread as with mp.Queue).
+        self._cmd_recv, self._cmd_send = mp.Pipe(duplex=False)
+        # Serializes both channels and hands out the shared sequence number that
+        # lets the cyclic process dispatch pipe and ring commands in send order.
+        self._cmd_send_lock = threading.Lock()
+        self._cmd_seq = 0
+        # The write end is non-blocking: frames the pipe cannot take yet wait in the
+        # outbox and are flushed by later sends or by the outbox flusher thread.
+        os.set_blocking(self._cmd_send.fileno(), False)
+        self._cmd_outbox = bytearray()
+        self._cmd_flusher: Optional[threading.Thread] = None
+        self._cmd_ring = CommandRing()
         self._status_q: mp.Queue = mp.Queue(maxsize=64)
         self._stop_event: mp.Event = mp.Event()
         self._proc: Optional[mp.Process] = None
         self._latest_status: Optional[NetworkStatus] = None
-        self._actuals_shm = mp.Array('l', SHM.ACTUALS_SIZE, lock=False)
-        self._targets_shm = mp.Array('l', SHM.TARGETS_SIZE, lock=False)
+        # Shared client.StatusProxy for this manager (see client.shared_status_proxy).
+        self.status_proxy: Optional[Any] = None
+        self._actuals_raw = SHM.alloc(SHM.ACTUALS_SIZE)
+        self._targets_raw = SHM.alloc(SHM.TARGETS_SIZE)
+        self._actuals_shm = SHM.aligned_view(self._actuals_raw, SHM.ACTUALS_SIZE)
+        self._targets_shm = SHM.aligned_view(self._targets_raw, SHM.TARGETS_SIZE)
+        self._slave_positions = frozenset(d.position for d in cfg.slaves if d.position < SHM.MAX_DRIVES)
+        self._status_plan = self._build_status_plan(cfg)
+        self._cia402_positions = frozenset(
+            d.position for d in cfg.slaves if getattr(d, 'cia402', True) and d.position < SHM.MAX_DRIVES
+        )
+
+    @staticmethod
+    def _build_status_plan(cfg: EthercatNetworkConfig) -> List[Tuple[int, int, Optional[Tuple[Tuple[Any, int], ...]]]]:
+        """
+        Resolve, once, where each slave's status lives in the actuals block.
+
+        Entries are (position, drive_base, io_slots); io_slots is None for CiA 402 drives
+        and a tuple of (register_entry, header_slot) for plain IO slaves, mirroring the
+        order in which the cyclic process packs DI/DO bytes.
+        """
+        plan = []
+        for dcfg in cfg.slaves:
+            pos = dcfg.position
+            if pos >= SHM.MAX_DRIVES:
+                continue
+            base = SHM.DRIVE_BASE + pos * SHM.DRIVE_STRIDE
+            if getattr(dcfg, 'cia402', True):
+                plan.append((pos, base, None))
+                continue
+            io_slots = []
+            di_idx = 0
+            do_idx = 0
+            for key in getattr(dcfg, 'register_entries', None) or []:
+                idx = key[0] if isinstance(key, tuple) else key
+                if 0x6000 <= idx < 0x6040:
+                    if di_idx < SHM.SLOT_IO_DI_COUNT:
+                        io_slots.append((key, SHM.SLOT_IO_DI_BASE + di_idx))
+                        di_idx += 1
+                elif 0x7040 <= idx < 0x7080:
+                    if do_idx < SHM.SLOT_IO_DO_COUNT:
+                        io_slots.append((key, SHM.SLOT_IO_DO_BASE + do_idx))
+                        do_idx += 1
+            plan.append((pos, base, tuple(io_slots)))
+        return plan
 
     def start(self):
         if self._proc and self._proc.is_alive():
             return
         self._stop_event.clear()
         target = EtherCATProcess(
-            self.cfg, self._cmd_q, self._status_q, self._stop_event,
-            actuals_shm=self._actuals_shm, targets_shm=self._targets_shm,
+            self.cfg, self._cmd_recv, self._status_q, self._stop_event,
+            actuals_shm=self._actuals_raw, targets_shm=self._targets_raw,
+            cmd_ring=self._cmd_ring,
         )
         self._proc = mp.Process(target=target.run, daemon=False)
         self._proc.start()
@@ -3531,14 +3858,200 @@ class EtherCATProcessManager:
 
     # Application API
     def send_command(self, cmd: Command):
-        try:
-            self._cmd_q.put_nowait(cmd)
+        if ring_eligible(cmd):
+            return self.send_setpoint(cmd.target_id, cmd.type, cmd.value)
+        with self._cmd_send_lock:
+            return self._send_frame_locked(cmd)
+
+    def send_setpoint(self, target_id: int, cmd_type: CommandType, value: Optional[Any]) -> bool:
+        """Push a streaming set-point (command_ring.RING_COMMAND_TYPES) without building a Command."""
+        with self._cmd_send_lock:
+            if self._cmd_outbox:
+                # An older command is still waiting for pipe space; a ring record would
+                # overtake it, so follow it down the pipe instead.
+                return self._send_frame_locked(Command(target_id=target_id, type=cmd_type, value=value))
+            if not self._cmd_ring.push(cmd_type, target_id, value, self._cmd_seq):
+                return False
+            self._cmd_seq += 1
             return True
-        except queue.Full:
+
+    def _send_frame_locked(self, cmd: Command) -> bool:
+        """
+        Queue (seq, cmd) on the command pipe without ever blocking (caller holds _cmd_send_lock).
+
+        The frame uses Connection's framing (4-byte big-endian length + pickle). Whatever
+        the pipe cannot take now, possibly the tail of a frame, stays in the outbox for
+        the flusher thread; the cyclic process reads through _CommandPipeReader, which
+        only hands out complete frames, so a split frame never stalls it. Returns False,
+        like the old put_nowait raising queue.Full, only when the outbox is over
+        _CMD_OUTBOX_MAX because the cyclic process is stalled or not running.
+        """
+        payload = ForkingPickler.dumps((self._cmd_seq, cmd))
+        outbox = self._cmd_outbox
+        if outbox and len(outbox) + len(payload) + 4 > _CMD_OUTBOX_MAX:
             return False
+        outbox += struct.pack("!i", len(payload))
+        outbox += payload
+        self._cmd_seq += 1
+        self._flush_outbox_locked()
+        if outbox and self._cmd_flusher is None:
+            self._cmd_flusher = threading.Thread(target=self._outbox_flusher, name="ec-cmd-flush", daemon=True)
+            self._cmd_flusher.start()
+        return True
 
-    def _build_status_from_shm(self) -> Optional[NetworkStatus]:
+    def _flush_outbox_locked(self) -> None:
+        outbox = self._cmd_outbox
+        fd = self._cmd_send.fileno()
+        while outbox:
+            try:
+                n = os.write(fd, outbox)
+            except BlockingIOError:
+                return
+            del outbox[:n]
+
+    def _outbox_flusher(self) -> None:
+        fd = self._cmd_send.fileno()
+        while True:
+            select.select((), (fd,), (), 0.05)
+            with self._cmd_send_lock:
+                try:
+                    self._flush_outbox_locked()
+                except OSError as e:
+                    logger.error("Command pipe closed, dropping %d unsent bytes: %s", len(self._cmd_outbox), e)
+                    self._cmd_outbox.clear()
+                if not self._cmd_outbox:
+                    self._cmd_flusher = None
+                    return
+
+    def status_sequence(self) -> int:
+        """Cycle count of the most recently published actuals frame (0 = nothing published yet)."""
+        return int(self._actuals_shm[SHM.SLOT_SEQUENCE])
+
+    def wait_for_status_update(self, timeout_s: float, since_seq: Optional[int] = None) -> bool:
+        """
+        Block until a status frame newer than `since_seq` (default: the current one)
+        is published, the cyclic process exits, or `timeout_s` elapses. Returns True
+        if a new frame arrived.
+
+        Polls the shared sequence slot at half the cycle period, so the cyclic
+        process never has to signal a cross-process primitive on its RT path.
+        """
+        shm = self._actuals_shm
+        start_seq = shm[SHM.SLOT_SEQUENCE] if since_seq is None else since_seq
+        deadline_ns = time.monotonic_ns() + max(0, int(timeout_s * 1_000_000_000))
+        poll_ns = max(int(self.cfg.cycle_time_ms * 500_000), 500_000)
+        while True:
+            if shm[SHM.SLOT_SEQUENCE] != start_seq:
+                return True
+            remaining_ns = deadline_ns - time.monotonic_ns()
+            if remaining_ns <= 0 or not self.is_alive():
+                return False
+            time.sleep(min(poll_ns, remaining_ns) / 1_000_000_000)
+
+    def read_drive_field(self, slave_position: int, key: str) -> Optional[Any]:
+        """
+        Read one published drive field in place from the actuals block.
+
+        Returns None for unknown keys, unconfigured slaves, CiA 402-only fields on
+        non-CiA 402 slaves, and before the cyclic process has published anything.
+        """
+        shm = self._actuals_shm
+        if shm[SHM.SLOT_SEQUENCE] == 0:
+            return None
+        if slave_position not in self._slave_positions:
+            return None
+        if key not in SHM.DRIVE_COMMON_FIELDS and slave_position not in self._cia402_positions:
+            return None
+        base = SHM.DRIVE_BASE + slave_position * SHM.DRIVE_STRIDE
+        slot = SHM.DRIVE_FIELD_SLOTS.get(key)
+        if slot is not None:
+            value = int(shm[base + slot])
+            return bool(value) if key in SHM.DRIVE_BOOL_FIELDS else value
+        mask = SHM.DRIVE_STATUSWORD_FLAGS.get(key)
+        if mask is not None:
+            return bool(shm[base + SHM.DRIVE_STATUSWORD] & mask)
+        return None
+
+    def drive_field_reader(self, slave_position: int, key: str) -> Optional[Callable[[], Any]]:
+        """
+        Build a zero-argument reader bound to one drive field's slot.
+
+        Same semantics as read_drive_field(), with the slot index and decoding resolved
+        once up front. Returns None if `key` is not a published field.
+        """
+        if key not in SHM.DRIVE_FIELD_SLOTS and key not in SHM.DRIVE_STATUSWORD_FLAGS:
+            return None
+        if slave_position not in self._slave_positions or (
+            key not in SHM.DRIVE_COMMON_FIELDS and slave_position not in self._cia402_positions
+        ):
+            return lambda: None
         shm = self._actuals_shm
+        seq_slot = SHM.SLOT_SEQUENCE
+        base = SHM.DRIVE_BASE + slave_position * SHM.DRIVE_STRIDE
+        slot = SHM.DRIVE_FIELD_SLOTS.get(key)
+        if slot is None:
+            idx = base + SHM.DRIVE_STATUSWORD
+            mask = SHM.DRIVE_STATUSWORD_FLAGS[key]
+
+            def read_flag():
+                return None if shm[seq_slot] == 0 else bool(shm[idx] & mask)
+            return read_flag
+        idx = base + slot
+        if key in SHM.DRIVE_BOOL_FIELDS:
+            def read_bool():
+                return None if shm[seq_slot] == 0 else bool(shm[idx])
+            return read_bool
+
+        def read_int():
+            return None if shm[seq_slot] == 0 else shm[idx]
+        return read_int
+
+    def csp_target_writer(self, slave_position: int) -> Optional[Callable[[float], bool]]:
+        """
+        Build a writer that publishes a CSP position set-point straight into the
+        targets block, bypassing the command channels entirely.
+
+        Equivalent to SET_POSITION_CSP with unit='native'. Returns None if the slave
+        has no target slot or motion commands are forbidden by config. The cyclic
+        process discards targets that arrive while the drive is manually disabled
+        or motion commands are forbidden, and targets superseded by a motion command
+        (ruckig move, stop, semi-rotary start, ...) sent after them.
+        """
+        if getattr(self.cfg, "forbid_motion_commands", False):
+            return None
+        if slave_position not in self._cia402_positions:
+            return None
+        shm = self._targets_shm
+        base = SHM.TARGET_BASE + slave_position * SHM.TARGET_STRIDE
+        csp_slot = base + SHM.TARGET_CSP
+        mode_slot = base + SHM.TARGET_MODE
+        valid_slot = base + SHM.TARGET_VALID
+        seq_slot = base + SHM.TARGET_CMD_SEQ
+
+        def write_csp(position: float) -> bool:
+            shm[mode_slot] = 0
+            shm[csp_slot] = int(float(position or 0.0))
+            # Commands sent from here on get this sequence number or later.
+            shm[seq_slot] = self._cmd_seq
+            shm[valid_slot] = 1
+            return True
+        return write_csp
+
+    def _snapshot_actuals(self, retries: int = 100) -> List[int]:
+        """Copy the actuals block under its seqlock so all slots belong to the same cycle."""
+        shm = self._actuals_shm
+        for _ in range(retries):
+            seq = shm[SHM.SLOT_SEQLOCK]
+            if seq & 1:
+                continue
+            snap = shm[:]
+            if shm[SHM.SLOT_SEQLOCK] == seq:
+                return snap
+        # Writer stalled mid-update (e.g. process killed); fall back to a best-effort copy.
+        return shm[:]
+
+    def _build_status_from_shm(self) -> Optional[NetworkStatus]:
+        shm = self._snapshot_actuals()
         if shm[SHM.SLOT_SEQUENCE] == 0:
             return None
         status = NetworkStatus(drives={})
@@ -3565,45 +4078,19 @@ class EtherCATProcessManager:
         status.all_slaves_op_first_ns = int(shm[SHM.SLOT_ALL_OP_FIRST_NS]) or None
         status.all_slaves_op_last_ns = int(shm[SHM.SLOT_ALL_OP_LAST_NS]) or None
         status.all_slaves_left_op_last_ns = int(shm[SHM.SLOT_ALL_OP_LEFT_LAST_NS]) or None
-        for dcfg in self.cfg.slaves:
-            pos = dcfg.position
-            if pos >= SHM.MAX_DRIVES:
-                continue
-            base = SHM.DRIVE_BASE + pos * SHM.DRIVE_STRIDE
-            drive = {}
-            drive['in_op'] = bool(shm[base + SHM.DRIVE_IN_OP])
-            drive['enabled'] = bool(shm[base + SHM.DRIVE_ENABLED])
-            if not getattr(dcfg, 'cia402', True):
-                raw_pdo = {}
-                reg_entries = getattr(dcfg, 'register_entries', None) or []
-                di_idx = 0
-                do_idx = 0
-                for key in reg_entries:
-                    idx = key[0] if isinstance(key, tuple) else key
-                    if 0x6000 <= idx < 0x6040:
-                        if di_idx < SHM.SLOT_IO_DI_COUNT:
-                            raw_pdo[key] = int(shm[SHM.SLOT_IO_DI_BASE + di_idx])
-                            di_idx += 1
-                    elif 0x7040 <= idx < 0x7080:
-                        if do_idx < SHM.SLOT_IO_DO_COUNT:
-                            raw_pdo[key] = int(shm[SHM.SLOT_IO_DO_BASE + do_idx])
-                            do_idx += 1
-                drive['raw_pdo'] = raw_pdo
-                status.drives[pos] = drive
-                continue
-            drive['statusword'] = int(shm[base + SHM.DRIVE_STATUSWORD])
-            drive['position_actual'] = int(shm[base + SHM.DRIVE_POSITION])
-            drive['velocity_actual'] = int(shm[base + SHM.DRIVE_VELOCITY])
-            drive['torque_actual'] = int(shm[base + SHM.DRIVE_TORQUE])
-            drive['mode_display'] = int(shm[base + SHM.DRIVE_MODE])
-            drive['error_code'] = int(shm[base + SHM.DRIVE_ERROR_CODE])
-            drive['digital_inputs'] = int(shm[base + SHM.DRIVE_DIGITAL_INPUTS])
-            drive['dip_in_state'] = int(shm[base + SHM.DRIVE_DIP_IN_STATE])
-            sw = drive['statusword']
-            state_bits = sw & 0x006F
-            drive['fault'] = bool(sw & 0x0008)
-            drive['warning'] = bool(sw & 0x0080)
-            drive['target_reached'] = bool(sw & 0x0400)
+        for pos, base, io_slots in self._status_plan:
+            drive = {
+                'in_op': bool(shm[base + SHM.DRIVE_IN_OP]),
+                'enabled': bool(shm[base + SHM.DRIVE_ENABLED]),
+            }
+            if io_slots is not None:
+                drive['raw_pdo'] = {key: shm[slot] for key, slot in io_slots}
+            else:
+                for key, slot in _CIA402_STATUS_SLOTS:
+                    drive[key] = shm[base + slot]
+                sw = drive['statusword']
+                for key, mask in _STATUSWORD_FLAG_ITEMS:
+                    drive[key] = bool(sw & mask)
             status.drives[pos] = drive
         return status
 
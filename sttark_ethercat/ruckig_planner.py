@@ -35,6 +35,7 @@ class RuckigCspPlanner:
         self._InputParameter = None
         self._OutputParameter = None
         self._Result = None
+        self._finished = None
         self._load_ruckig()
 
         # slave_pos -> state
@@ -51,13 +52,15 @@ class RuckigCspPlanner:
             self._InputParameter = getattr(ruckig, "InputParameter", None)
             self._OutputParameter = getattr(ruckig, "OutputParameter", None)
             self._Result = getattr(ruckig, "Result", None)
+            self._finished = getattr(self._Result, "Finished", None)
         except Exception as e:
             self._ruckig = None
             self._Ruckig = None
             self._InputParameter = None
             self._OutputParameter = None
             self._Result = None
-            logger.warning(f"Ruckig import failed; planner unavailable: {e}")
+            self._finished = None
+            logger.warning("Ruckig import failed; planner unavailable: %s", e)
 
     def available(self) -> bool:
         return bool(self._Ruckig and self._InputParameter and self._OutputParameter)
@@ -159,6 +162,7 @@ class RuckigCspPlanner:
             "dt": dt,
             "lookahead_s": float(cfg.velocity_lookahead_s),
             "error": None,
+            "pass_to_input": getattr(out, "pass_to_input", None),
         }
 
     def start_velocity(
@@ -209,6 +213,8 @@ class RuckigCspPlanner:
             "lookahead_s": lookahead,
             "error": None,
             "position_offset": 0,
+            "pass_to_input": getattr(out, "pass_to_input", None),
+            "applied_target_velocity": float(target_velocity),
         }
 
     def step(
@@ -232,46 +238,51 @@ class RuckigCspPlanner:
         try:
             inp = s["inp"]
             out = s["out"]
-            otg = s["otg"]
+            velocity_mode = s["mode"] == "velocity"
 
-            if s.get("mode") == "velocity":
-                tv = float(s.get("target_velocity") or 0.0)
-                cur_pos = float(inp.current_position[0])
+            if velocity_mode:
+                cur_pos = inp.current_position[0]
 
                 if abs(cur_pos) > 1_000_000_000:
                     shift = int(round(cur_pos))
                     inp.current_position = [cur_pos - shift]
-                    s["position_offset"] = s.get("position_offset", 0) + shift
+                    s["position_offset"] += shift
 
-                inp.target_velocity = [tv]
-                inp.target_acceleration = [0.0]
+                # Only rebuild the binding's target list when the target actually changed;
+                # target_acceleration stays at 0.0 from start_velocity().
+                tv = float(s["target_velocity"] or 0.0)
+                if tv != s["applied_target_velocity"]:
+                    inp.target_velocity = [tv]
+                    s["applied_target_velocity"] = tv
 
             try:
-                res = otg.update(inp, out)
+                res = s["otg"].update(inp, out)
             except Exception:
-                if s.get("mode") != "velocity" or s.get("velocity_recovery_attempted"):
+                if not velocity_mode or s.get("velocity_recovery_attempted"):
                     raise
                 s["velocity_recovery_attempted"] = True
                 tv = float(s.get("target_velocity") or 0.0)
                 inp.current_acceleration = [0.0]
                 inp.target_velocity = [tv]
                 inp.target_acceleration = [0.0]
-                res = otg.update(inp, out)
-            done = self._is_finished(res)
-
-            if hasattr(out, "pass_to_input"):
-                out.pass_to_input(inp)
+                s["applied_target_velocity"] = tv
+                res = s["otg"].update(inp, out)
+            finished = self._finished
+            done = finished is not None and res == finished
+
+            pass_to_input = s["pass_to_input"]
+            if pass_to_input is not None:
+                pass_to_input(inp)
             else:
                 inp.current_position = list(out.new_position)
                 inp.current_velocity = list(out.new_velocity)
                 inp.current_acceleration = list(out.new_acceleration)
 
-            offset = s.get("position_offset", 0)
-            pos = int(round(float(out.new_position[0]))) + offset
+            pos = int(round(out.new_position[0])) + s.get("position_offset", 0)
             vel = float(out.new_velocity[0])
             acc = float(out.new_acceleration[0])
 
-            if done and s.get("mode") == "position":
+            if done and not velocity_mode:
                 # For position moves, auto-stop when finished.
                 self._state.pop(slave_pos, None)
 
@@ -279,7 +290,7 @@ class RuckigCspPlanner:
         except Exception as e:
             s["error"] = str(e)
             self._last_error[slave_pos] = str(e)
-            logger.error(f"Ruckig step failed for slave {slave_pos}: {e}")
+            logger.error("Ruckig step failed for slave %s: %s", slave_pos, e)
             # On failure, stop motion generation for safety.
             self._state.pop(slave_pos, None)
             return None
@@ -309,11 +320,9 @@ class RuckigCspPlanner:
         """
         Determine if Ruckig is finished, across binding variants.
         """
-        Result = self._Result
-        if Result is not None:
-            finished = getattr(Result, "Finished", None)
-            if finished is not None:
-                return res == finished
+        finished = self._finished
+        if finished is not None:
+            return res == finished
         # Some bindings return strings or ints; treat unknown as "not finished"
         return False
 
@@ -1,11 +1,32 @@
 """
 Shared memory layout for cyclic process <-> external process communication.
 
-Two flat arrays of int64 (multiprocessing.Array('l', N, lock=False)):
+Two flat arrays of int64 (see alloc() / aligned_view()):
   - actuals_shm: cyclic process writes after process_domain(), others read
   - targets_shm: semi-rotary cam process writes, cyclic process reads
+
+actuals_shm is guarded by a seqlock (SLOT_SEQLOCK): the writer makes it odd
+before touching the block and even again when done. Readers that need a
+consistent multi-slot snapshot retry while it is odd or changed under them;
+single-slot reads are naturally atomic and need no retry.
+
+Slots are 8 bytes. The header and every per-drive record are padded to whole
+64-byte cache lines, so readers polling one drive and writers touching another
+do not contend for the same line. multiprocessing only guarantees 8-byte
+alignment for shared ctypes objects, so each block is allocated with a spare
+line (alloc) and every process indexes it through a view starting at the
+first 64-byte boundary (aligned_view). The heap arena is mmap'd page-aligned,
+so the padding is the same in every process that maps it.
 """
 
+import ctypes
+import multiprocessing as mp
+
+from .constants import SW_MASK_FAULT, SW_MASK_WARNING, SW_MASK_TARGET_REACHED
+
+CACHE_LINE_BYTES = 64
+CACHE_LINE_SLOTS = CACHE_LINE_BYTES // ctypes.sizeof(ctypes.c_long)
+
 # --- actuals_shm: header slots (global metrics) ---
 SLOT_SEQUENCE = 0
 SLOT_CYCLE_COUNT = 1
@@ -36,11 +57,13 @@ SLOT_IO_DI_COUNT = 4
 SLOT_IO_DO_BASE = 27
 SLOT_IO_DO_COUNT = 4
 
-HEADER_SIZE = 32
+SLOT_SEQLOCK = 31
+
+HEADER_SIZE = 32  # 4 cache lines
 
 # --- actuals_shm: per-drive slots ---
 DRIVE_BASE = HEADER_SIZE
-DRIVE_STRIDE = 10
+DRIVE_STRIDE = 2 * CACHE_LINE_SLOTS  # 10 slots used, padded to 128 bytes
 DRIVE_POSITION = 0
 DRIVE_VELOCITY = 1
 DRIVE_TORQUE = 2
@@ -53,14 +76,55 @@ DRIVE_DIGITAL_INPUTS = 8
 DRIVE_DIP_IN_STATE = 9
 
 MAX_DRIVES = 16
+
+# Status field name (as published in NetworkStatus.drives) -> per-drive slot.
+DRIVE_FIELD_SLOTS = {
+    "position_actual": DRIVE_POSITION,
+    "velocity_actual": DRIVE_VELOCITY,
+    "torque_actual": DRIVE_TORQUE,
+    "statusword": DRIVE_STATUSWORD,
+    "mode_display": DRIVE_MODE,
+    "error_code": DRIVE_ERROR_CODE,
+    "in_op": DRIVE_IN_OP,
+    "enabled": DRIVE_ENABLED,
+    "digital_inputs": DRIVE_DIGITAL_INPUTS,
+    "dip_in_state": DRIVE_DIP_IN_STATE,
+}
+# Fields published for every slave; the rest only exist for CiA 402 drives.
+DRIVE_COMMON_FIELDS = frozenset(("in_op", "enabled"))
+DRIVE_BOOL_FIELDS = frozenset(("in_op", "enabled"))
+# Derived status flags, decoded from the statusword slot.
+DRIVE_STATUSWORD_FLAGS = {
+    "fault": SW_MASK_FAULT,
+    "warning": SW_MASK_WARNING,
+    "target_reached": SW_MASK_TARGET_REACHED,
+}
 ACTUALS_SIZE = DRIVE_BASE + MAX_DRIVES * DRIVE_STRIDE
 
-# --- targets_shm: semi-rotary cam targets ---
+# --- targets_shm: per-drive CSP targets (semi-rotary cam, direct CSP streaming) ---
+# Writers store TARGET_MODE, TARGET_CSP and TARGET_CMD_SEQ before setting
+# TARGET_VALID = 1; the cyclic process clears TARGET_VALID before reading them.
+# TARGET_MODE = 0 leaves the commanded mode unchanged (plain CSP set-point).
+# TARGET_CMD_SEQ is the manager's next command sequence number at write time: a
+# target is dropped if a motion command for the drive with that sequence number
+# or later has already been dispatched, since that command was sent after it.
 TARGET_SEQUENCE = 0
-TARGET_BASE = 1
-TARGET_STRIDE = 3
+TARGET_BASE = CACHE_LINE_SLOTS  # sequence slot gets its own line
+TARGET_STRIDE = CACHE_LINE_SLOTS  # 4 slots used, padded to 64 bytes
 TARGET_CSP = 0
 TARGET_MODE = 1
 TARGET_VALID = 2
+TARGET_CMD_SEQ = 3
 
 TARGETS_SIZE = TARGET_BASE + MAX_DRIVES * TARGET_STRIDE
+
+
+def alloc(n_slots: int):
+    """Allocate a shared block for n_slots int64 slots plus one line of alignment slack."""
+    return mp.RawArray(ctypes.c_char, n_slots * ctypes.sizeof(ctypes.c_long) + CACHE_LINE_BYTES)
+
+
+def aligned_view(raw, n_slots: int):
+    """Return an int64 array of n_slots over raw (from alloc) starting on a cache-line boundary."""
+    pad = -ctypes.addressof(raw) % CACHE_LINE_BYTES
+    return (ctypes.c_long * n_slots).from_buffer(raw, pad)
@@ -3,10 +3,16 @@ import time
 from typing import Callable, Optional
 
 
+# Pending checks kept per instance; older ones are dropped once the bound is reached.
+MAX_PENDING_CHECKS = 32
+
+
 class PendingCheck:
-    def __init__(self, name: str, deadline: float, verify: Callable[[], bool], heal: Optional[Callable[[], None]] = None):
+    __slots__ = ("name", "deadline_ns", "verify", "heal")
+
+    def __init__(self, name: str, deadline_ns: int, verify: Callable[[], bool], heal: Optional[Callable[[], None]] = None):
         self.name = name
-        self.deadline = deadline
+        self.deadline_ns = deadline_ns  # time.monotonic_ns() deadline
         self.verify = verify
         self.heal = heal
 
@@ -14,9 +20,10 @@ class PendingCheck:
 def nonblocking_check(name: str, timeout_s: float = 1.0, heal: Optional[Callable] = None):
     """
     Decorator to schedule a self-check without blocking the caller.
-    Assumes the instance has an attribute `_pending_checks` (list) that the
-    cyclic process will poll and attempt.
+    Assumes the instance has an attribute `_pending_checks` (a deque bounded by
+    MAX_PENDING_CHECKS, or a list) that the cyclic process will poll and attempt.
     """
+    timeout_ns = int(timeout_s * 1_000_000_000)
 
     def decorator(func):
         @functools.wraps(func)
@@ -29,8 +36,8 @@ def nonblocking_check(name: str, timeout_s: float = 1.0, heal: Optional[Callable
                 except Exception:
                     return False
 
-            deadline = time.time() + timeout_s
-            self._pending_checks.append(PendingCheck(name=name, deadline=deadline, verify=verify, heal=heal))
+            deadline_ns = time.monotonic_ns() + timeout_ns
+            self._pending_checks.append(PendingCheck(name=name, deadline_ns=deadline_ns, verify=verify, heal=heal))
             return result
 
         return wrapper
@@ -0,0 +1,78 @@
+import unittest
+
+from sttark_ethercat.command_ring import CommandRing, collect_in_order
+from sttark_ethercat.commands import Command, CommandType
+
+
+class FakeConn:
+    """Pipe stand-in: `frames` are (seq, Command); `on_poll` runs before each poll."""
+
+    def __init__(self, frames=(), on_poll=None):
+        self.frames = list(frames)
+        self.on_poll = on_poll
+
+    def poll(self):
+        if self.on_poll is not None:
+            self.on_poll(self)
+        return bool(self.frames)
+
+    def recv(self):
+        return self.frames.pop(0)
+
+
+def kinds(cmds):
+    return [(c.type, c.value) for _, c in cmds]
+
+
+class CollectInOrderTest(unittest.TestCase):
+    def test_setpoint_pushed_between_mark_and_poll_runs_before_newer_stop(self):
+        ring = CommandRing()
+
+        def send_after_mark(conn):
+            # send_setpoint(SET_VELOCITY, 100); send_command(STOP_MOTION)
+            conn.on_poll = None
+            ring.push(CommandType.SET_VELOCITY, 0, 100, seq=1)
+            conn.frames.append((2, Command(0, CommandType.STOP_MOTION)))
+
+        conn = FakeConn(on_poll=send_after_mark)
+        self.assertEqual(
+            kinds(collect_in_order(conn, ring)),
+            [(CommandType.SET_VELOCITY, 100), (CommandType.STOP_MOTION, None)],
+        )
+        self.assertEqual(collect_in_order(conn, ring), [])
+
+    def test_setpoint_newer_than_unread_pipe_frame_waits(self):
+        ring = CommandRing()
+
+        def race(conn):
+            # The pipe looked empty; a STOP and a newer set-point arrive right after.
+            conn.on_poll = None
+            conn.frames_later = [(1, Command(0, CommandType.STOP_MOTION))]
+            ring.push(CommandType.SET_VELOCITY, 0, 5, seq=2)
+
+        conn = FakeConn(on_poll=race)
+        self.assertEqual(collect_in_order(conn, ring), [])
+        conn.frames = conn.frames_later
+        self.assertEqual(
+            kinds(collect_in_order(conn, ring)),
+            [(CommandType.STOP_MOTION, None), (CommandType.SET_VELOCITY, 5)],
+        )
+
+    def test_pipe_backlog_bounds_ring_drain(self):
+        ring = CommandRing()
+        frames = []
+        for i in range(4):
+            frames.append((2 * i, Command(0, CommandType.STOP_MOTION)))
+            ring.push(CommandType.SET_VELOCITY, 0, i, seq=2 * i + 1)
+        conn = FakeConn(frames)
+        first = kinds(collect_in_order(conn, ring, pipe_budget=2))
+        self.assertEqual(first, [
+            (CommandType.STOP_MOTION, None), (CommandType.SET_VELOCITY, 0), (CommandType.STOP_MOTION, None),
+        ])
+        rest = kinds(collect_in_order(conn, ring, pipe_budget=2))
+        self.assertEqual(rest[0], (CommandType.SET_VELOCITY, 1))
+        self.assertEqual(rest[-1], (CommandType.SET_VELOCITY, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()